@@ -0,0 +1,408 @@
+# -*- encoding: utf-8 -*-
+
+"""Benchmarks for hot paths of enums.py, compared to standard library enum module.
+
+Run with python -m bench_enums [--json] [--output PATH] [--filter TEXT] [--sizes N ...].
+
+Results are given in seconds per operation; ratio is enums time divided by stdlib time.
+Import time is measured in fresh interpreters, using python -X importtime.
+"""
+
+from argparse import ArgumentParser
+import enum
+import json
+from pathlib import Path
+import pickle
+import platform
+import subprocess
+import sys
+import time
+from timeit import Timer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+import enums
+
+__all__ = ("BENCHMARKS", "Library", "benchmark", "main", "measure", "measure_import", "run")
+
+DEFAULT_REPEAT = 5
+DEFAULT_SIZES = (10, 1_000, 10_000)  # larger sizes take minutes with stdlib enum
+SLOW = 1.0  # do not repeat measurements that take longer than this (in seconds)
+
+# enums used for benchmarks are defined on module level, so they can be pickled
+
+
+class Color(enums.Enum):
+    RED = 1
+    GREEN = 2
+    BLUE = 3
+    CYAN = 4
+    MAGENTA = 5
+    YELLOW = 6
+    BLACK = 7
+    WHITE = 8
+
+
+class StdColor(enum.Enum):
+    RED = 1
+    GREEN = 2
+    BLUE = 3
+    CYAN = 4
+    MAGENTA = 5
+    YELLOW = 6
+    BLACK = 7
+    WHITE = 8
+
+
+class Perm(enums.Flag):
+    Z = 0
+    X = 1
+    W = 2
+    R = 4
+
+
+class StdPerm(enum.Flag):
+    Z = 0
+    X = 1
+    W = 2
+    R = 4
+
+
+class Sign(enums.Order, enums.Enum):
+    MINUS = -1
+    ZERO = 0
+    PLUS = 1
+
+
+class StdSign(enum.IntEnum):
+    MINUS = -1
+    ZERO = 0
+    PLUS = 1
+
+
+class Library:
+    """Enum implementation along with enums defined using it."""
+
+    def __init__(
+        self, name: str, module: Any, color: Type[Any], perm: Type[Any], sign: Type[Any]
+    ) -> None:
+        self.name = name
+        self.module = module
+        self.color = color
+        self.perm = perm
+        self.sign = sign
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.name!r}>"
+
+
+ENUMS = Library("enums", enums, Color, Perm, Sign)
+STDLIB = Library("stdlib", enum, StdColor, StdPerm, StdSign)
+
+# benchmark factories take library and return function to measure (or None if not applicable);
+# benchmarks with custom measures return whatever their measure takes instead of function
+Factory = Callable[[Library], Optional[Any]]
+Measure = Callable[[Any, int], float]
+
+BENCHMARKS: List[Tuple[str, Factory, Optional[Measure]]] = []
+
+
+def benchmark(name: str, measure_with: Optional[Measure] = None) -> Callable[[Factory], Factory]:
+    """Register benchmark factory under given name, optionally with custom measure."""
+
+    def register(factory: Factory) -> Factory:
+        BENCHMARKS.append((name, factory, measure_with))
+        return factory
+
+    return register
+
+
+def measure_import(module: str, repeat: int = DEFAULT_REPEAT) -> float:
+    """Measure time (in seconds) that importing module takes in fresh interpreter,
+    using cumulative time reported by python -X importtime (best of repeat runs).
+    """
+    # run next to enums, so that the same enums is imported even if it is not installed
+    directory = Path(enums.__file__).parent
+    times = []
+
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=str(directory),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        )
+
+        for line in process.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            _, cumulative, name = line.split("|")
+
+            if name.strip() == module:
+                times.append(int(cumulative) / 1e6)
+                break
+
+        else:  # pragma: no cover
+            raise RuntimeError(f"{module} is imported on interpreter startup.")
+
+    return min(times)
+
+
+@benchmark("import", measure_with=measure_import)
+def bench_import(lib: Library) -> str:
+    return lib.module.__name__
+
+
+@benchmark("member_by_value")
+def bench_member_by_value(lib: Library) -> Callable[[], Any]:
+    color = lib.color
+    return lambda: color(3)
+
+
+@benchmark("member_by_name")
+def bench_member_by_name(lib: Library) -> Callable[[], Any]:
+    color = lib.color
+    return lambda: color["BLUE"]
+
+
+@benchmark("member_by_ci_name")
+def bench_member_by_ci_name(lib: Library) -> Optional[Callable[[], Any]]:
+    if lib is STDLIB:
+        return None  # not supported
+
+    color = lib.color
+    return lambda: color.from_name("blue")
+
+
+@benchmark("iteration")
+def bench_iteration(lib: Library) -> Callable[[], Any]:
+    color = lib.color
+    return lambda: list(color)
+
+
+@benchmark("iteration_reversed")
+def bench_iteration_reversed(lib: Library) -> Callable[[], Any]:
+    color = lib.color
+    return lambda: list(reversed(color))
+
+
+@benchmark("flag_or")
+def bench_flag_or(lib: Library) -> Callable[[], Any]:
+    r, w = lib.perm.R, lib.perm.W
+    return lambda: r | w
+
+
+@benchmark("flag_and")
+def bench_flag_and(lib: Library) -> Callable[[], Any]:
+    rw, r = lib.perm.R | lib.perm.W, lib.perm.R
+    return lambda: rw & r
+
+
+@benchmark("flag_invert")
+def bench_flag_invert(lib: Library) -> Callable[[], Any]:
+    r = lib.perm.R
+    return lambda: ~r
+
+
+def create_wide_flag(lib: Library, bits: int = 72) -> Type[Any]:
+    return lib.module.Flag("Wide", [(f"F{bit}", 1 << bit) for bit in range(bits)])
+
+
+@benchmark("flag_invert_wide_72")
+def bench_flag_invert_wide(lib: Library) -> Callable[[], Any]:
+    wide = create_wide_flag(lib)
+    member = wide.F3 | wide.F40
+
+    ~member  # create inverted composite before measuring
+
+    return lambda: ~member
+
+
+@benchmark("flag_or_wide_72")
+def bench_flag_or_wide(lib: Library) -> Callable[[], Any]:
+    wide = create_wide_flag(lib)
+    first, second = wide.F3, wide.F70
+
+    first | second  # create composite before measuring
+
+    return lambda: first | second
+
+
+@benchmark("flag_composite_creation_256")
+def bench_flag_composite_creation(lib: Library) -> Callable[[], Any]:
+    flag = lib.module.Flag
+    names = [f"F{bit}" for bit in range(8)]
+
+    def create_composites() -> None:
+        wide = flag("Wide", [(name, 1 << bit) for bit, name in enumerate(names)])
+
+        for value in range(256):
+            wide(value)
+
+    return create_composites
+
+
+@benchmark("flag_decompose")
+def bench_flag_decompose(lib: Library) -> Optional[Callable[[], Any]]:
+    rwx = lib.perm.R | lib.perm.W | lib.perm.X
+
+    if lib is ENUMS:
+        return rwx.decompose
+
+    try:
+        list(rwx)
+
+    except TypeError:  # flags are not iterable in older versions
+        return None
+
+    return lambda: list(rwx)
+
+
+@benchmark("order_comparison")
+def bench_order_comparison(lib: Library) -> Callable[[], Any]:
+    minus, plus = lib.sign.MINUS, lib.sign.PLUS
+    return lambda: minus < plus
+
+
+@benchmark("pickle_member")
+def bench_pickle_member(lib: Library) -> Callable[[], Any]:
+    blue = lib.color.BLUE
+    dumps, loads = pickle.dumps, pickle.loads
+    return lambda: loads(dumps(blue))
+
+
+def add_creation_benchmarks(sizes: Iterable[int]) -> None:
+    """Register class creation benchmarks for given sizes (counts of members)."""
+    for size in sizes:
+
+        def create_factory(lib: Library, size: int = size) -> Callable[[], Any]:
+            names = [f"M{index}" for index in range(size)]
+            enum_type = lib.module.Enum
+            return lambda: enum_type("Big", names)
+
+        benchmark(f"create_enum_{size}")(create_factory)
+
+
+def measure(function: Callable[[], Any], repeat: int = DEFAULT_REPEAT) -> float:
+    """Measure time (in seconds) that one call of function takes."""
+    timer = Timer(function)
+
+    number, elapsed = timer.autorange()
+
+    if elapsed / number > SLOW:  # too slow to repeat
+        return elapsed / number
+
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(
+    filters: Iterable[str] = (), repeat: int = DEFAULT_REPEAT, stdlib: bool = True
+) -> List[Dict[str, Any]]:
+    """Run registered benchmarks, returning results."""
+    filters = list(filters)
+    libraries = (ENUMS, STDLIB) if stdlib else (ENUMS,)
+
+    results = []
+
+    for name, factory, measure_with in BENCHMARKS:
+        if filters and not any(part in name for part in filters):
+            continue
+
+        if measure_with is None:
+            measure_with = measure
+
+        result: Dict[str, Any] = dict(name=name)
+
+        for lib in libraries:
+            function = factory(lib)
+
+            result[lib.name] = None if function is None else measure_with(function, repeat)
+
+        ours, theirs = result[ENUMS.name], result.get(STDLIB.name)
+
+        result.update(ratio=ours / theirs if ours is not None and theirs else None)
+
+        results.append(result)
+
+    return results
+
+
+def get_metadata() -> Dict[str, Any]:
+    return dict(
+        enums=enums.__version__,
+        python=platform.python_version(),
+        implementation=platform.python_implementation(),
+        platform=platform.platform(),
+        time=time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    )
+
+
+def format_time(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def format_table(results: List[Dict[str, Any]]) -> str:
+    rows = [("benchmark", "enums", "stdlib", "ratio")]
+
+    for result in results:
+        ratio = result["ratio"]
+
+        rows.append(
+            (
+                result["name"],
+                format_time(result["enums"]),
+                format_time(result.get("stdlib")),
+                "-" if ratio is None else f"{ratio:.2f}",
+            )
+        )
+
+    widths = [max(len(row[index]) for row in rows) for index in range(len(rows[0]))]
+
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows
+    )
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = ArgumentParser(prog="python -m bench_enums", description=__doc__.splitlines()[0])
+
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--output", help="path to write JSON results to")
+    parser.add_argument(
+        "--filter", action="append", default=[], help="run benchmarks containing text"
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="repeat count")
+    parser.add_argument(
+        "--sizes", type=int, nargs="*", default=DEFAULT_SIZES, help="member counts to create"
+    )
+    parser.add_argument("--no-stdlib", action="store_true", help="skip stdlib benchmarks")
+
+    namespace = parser.parse_args(args)
+
+    add_creation_benchmarks(namespace.sizes)
+
+    results = run(namespace.filter, namespace.repeat, stdlib=not namespace.no_stdlib)
+
+    report = dict(metadata=get_metadata(), results=results)
+
+    if namespace.output is not None:
+        with open(namespace.output, "w") as file:
+            json.dump(report, file, indent=4)
+
+    if namespace.json:
+        json.dump(report, sys.stdout, indent=4)
+        print()
+
+    else:
+        print(format_table(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -60,59 +60,110 @@ __copyright__ = "Copyright 2020 nekitdev"
 __license__ = "MIT"
 __version__ = "0.5.0"
 
+# imports are kept cheap, since enums are often imported by short-lived programs:
+# typing is only imported by type checkers (annotations are strings), and modules used
+# by opt-in features (array, copyreg, json, threading, weakref and others) are imported
+# by functions that need them; os and sys are imported on interpreter startup anyway,
+# and types is needed for DynamicClassAttribute of Enum itself
+import itertools
+import os
 import sys
-from types import DynamicClassAttribute as dynamic_attribute, FrameType, MappingProxyType
-from typing import (
-    Any,
-    Callable,
-    Dict,
-    Iterable,
-    Iterator,
-    List,
-    Optional,
-    Set,
-    Tuple,
-    Type,
-    TypeVar,
-    Union,
-)
-
-try:
-    from typing import NoReturn  # type: ignore  # this may error on earlier versions
-
-except ImportError:  # pragma: no cover
-    NoReturn = None  # type: ignore
+from types import DynamicClassAttribute as dynamic_attribute, MappingProxyType
+
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:  # pragma: no cover
+    from array import array
+    from types import FrameType
+    from typing import (
+        Any,
+        AsyncIterable,
+        AsyncIterator,
+        Callable,
+        Dict,
+        FrozenSet,
+        Iterable,
+        Iterator,
+        List,
+        Mapping,
+        NoReturn,
+        Optional,
+        Set,
+        Tuple,
+        Type,
+        TypeVar,
+        Union,
+    )
+    from weakref import WeakValueDictionary
+
+    E = TypeVar("E", bound="Enum")  # used for enum typing
+    T = TypeVar("T")  # used for general typing
+    U = TypeVar("U")  # used for general typing
 
 __all__ = (
     "EnumMeta",
     "Enum",
     "IntEnum",
+    "StrEnum",
     "Flag",
     "IntFlag",
+    "JSONCodec",
     "Trait",
     "Order",
     "StrFormat",
     "auto",
     "unique",
     "enum_generate_next_value",
+    "cache_created",
+    "creation_report",
+    "instrument",
+    "memory_report",
+    "memory_reports",
+    "print_creation_report",
+    "profile_creation",
+    "uninstrument",
 )
 
 DEFAULT_DOCUMENTATION = "An enumeration."
 DEFAULT_DIR_INCLUDE = ["__class__", "__doc__", "__module__", "__members__"]  # some dir() dunders
 DESCRIPTOR_ATTRIBUTES = ("__get__", "__set__", "__delete__")  # attributes that define a descriptor
 ENUM_DEFINITION = "EnumName([mixin_type, ...] [data_type] enum_type)"  # enum subclass definition
-ENUM_PRESERVE = ("__format__", "__repr__", "__str__", "__reduce_ex__")
+ENUM_PRESERVE = ("__format__", "__repr__", "__str__", "__reduce_ex__", "__copy__", "__deepcopy__")
 PICKLE_METHODS = ("__getnewargs_ex__", "__getnewargs__", "__reduce_ex__", "__reduce__")
 INVALID_ENUM_NAMES = {"mro", ""}  # any others?
+BATCH_SIZE = 1024  # amount of tokens converted at once by AsyncParseStream
+FLAG_PACK_BITS = 63  # flags are packed as signed 64-bit values, so this many bits can be used
+CHUNK_SIZE = 1 << 22  # size of byte ranges converted by each task of convert_file()
+MEMO_SIZE = 4096  # maximum amount of tokens memoized by ParseStream and composite names
 OBJECT_DIR = object.__dir__  # function to use for fetching dirs
 OBJECT_NEW = object.__new__  # default new function used to create enum values
 USELESS_NEW = {None, None.__new__, object.__new__}  # Enum's new is added here when it is defined
 
-E = TypeVar("E", bound="Enum")  # used for enum typing
-T = TypeVar("T")  # used for general typing
-U = TypeVar("U")  # used for general typing
-
 ENUM_DEFINED = False  # flag that is going to be set after Enum class will be created
+INSTRUMENT_ENUMS = False  # flag that indicates whether new enums should be instrumented
+# flag that indicates whether creation of enums should be profiled, see profile_creation()
+PROFILE_CREATION = bool(os.environ.get("ENUMS_PROFILE_CREATION"))
+# flag that indicates whether functional API should reuse enums with same spec, see cache_created()
+CACHE_CREATED = False
+
+# spec -> class mapping of enums created with functional API, see EnumMeta.create(),
+# along with token -> class mapping of them, used when unpickling them;
+# tokens are unique per class, so enums that share the same spec are told apart;
+# both are created along with the first functional enum, see _get_functional_registry()
+FUNCTIONAL_REGISTRY: "List[Tuple[WeakValueDictionary, WeakValueDictionary]]" = []
+# tokens are prefixed with random process key, so tokens of other processes do not collide
+FUNCTIONAL_TOKEN_KEY = os.urandom(8).hex()
+FUNCTIONAL_TOKEN_COUNTER = itertools.count()
+
+
+def cache_created(enabled: bool = True) -> None:
+    """Enable (or disable) reusing enums created with functional API.
+    When enabled, creating an enum with the same spec (base, name, members, module,
+    qualname and type) as an existing one returns that enum instead of creating a new one.
+    """
+    global CACHE_CREATED
+
+    CACHE_CREATED = enabled
 
 
 class Singleton:
@@ -173,7 +224,7 @@ except AttributeError:  # pragma: no cover
     class _GetFrame(Exception):
         pass
 
-    def _get_frame(level: int = 0) -> FrameType:
+    def _get_frame(level: int = 0) -> "FrameType":
         try:
             raise _GetFrame()
 
@@ -207,7 +258,7 @@ def _is_strict_dunder(string: str) -> bool:
     return _starts_and_ends_with(string, "_", times=2, strict=True)
 
 
-def _is_descriptor(some_object: Any) -> bool:
+def _is_descriptor(some_object: "Any") -> bool:
     for attribute in DESCRIPTOR_ATTRIBUTES:
         if hasattr(some_object, attribute):
             return True
@@ -215,7 +266,7 @@ def _is_descriptor(some_object: Any) -> bool:
     return False
 
 
-def _find_data_type(bases: Tuple[Type[Any], ...]) -> Type[T]:
+def _find_data_type(bases: "Tuple[Type[Any], ...]") -> "Type[T]":
     for chain in bases:
         for base in chain.__mro__:
             if base is object:  # not useful in our case
@@ -230,22 +281,117 @@ def _find_data_type(bases: Tuple[Type[Any], ...]) -> Type[T]:
     return object  # nothing found, so return object class
 
 
-def _make_class_unpicklable(cls: Type[T]) -> None:
-    def _break_on_reduce_attempt(instance: T, protocol: int) -> NoReturn:  # pragma: no cover
+def _make_class_unpicklable(cls: "Type[T]") -> None:
+    def _break_on_reduce_attempt(instance: "T", protocol: int) -> "NoReturn":  # pragma: no cover
         raise TypeError(f"{instance} can not be pickled.")
 
     cls.__reduce_ex__ = _break_on_reduce_attempt  # type: ignore
     cls.__module__ = "<unknown>"
 
 
-def _make_class_dict_unpicklable(cls_dict: Dict[str, Any]) -> None:
-    def _break_on_reduce_attempt(instance: T, protocol: int) -> NoReturn:  # pragma: no cover
+def _make_class_dict_unpicklable(cls_dict: "Dict[str, Any]") -> None:
+    def _break_on_reduce_attempt(instance: "T", protocol: int) -> "NoReturn":  # pragma: no cover
         raise TypeError(f"{instance} can not be pickled.")
 
     cls_dict.update(__reduce_ex__=_break_on_reduce_attempt, __module__="<unknown>")
 
 
-def _make_readable(entity: Optional[T], on_undefined: str = "undefined") -> str:
+def _is_importable(cls: "Type[T]") -> bool:
+    """Check whether the class can be found by its module and qualified name."""
+    target = sys.modules.get(cls.__module__)
+
+    for name in cls.__qualname__.split("."):
+        target = getattr(target, name, None)
+
+    return target is cls
+
+
+def _load_member(enum_class: "Type[E]", name: str) -> "E":
+    """Load member by name. Used when unpickling members of enums with compact pickling."""
+    return enum_class._member_map[name]
+
+
+def _create_once(holder: "List[T]", create: "Callable[[], T]") -> "T":
+    """Return object kept in holder, creating it if needed. Threads that race to create it
+    all return the first object appended to holder, so no lock is needed.
+    """
+    if not holder:
+        holder.append(create())
+
+    return holder[0]
+
+
+def _create_lock() -> "Any":
+    import threading
+
+    return threading.RLock()
+
+
+def _get_lock(enum_class: "Type[E]") -> "Any":
+    """Return lock that serializes writers of the enum class."""
+    return _create_once(enum_class._lock_holder, _create_lock)
+
+
+def _create_functional_registry() -> "Tuple[WeakValueDictionary, WeakValueDictionary]":
+    import copyreg
+    from weakref import WeakValueDictionary
+
+    # enums created with functional API may have to be pickled by spec, see _reduce_enum()
+    copyreg.pickle(EnumMeta, _reduce_enum)
+
+    return WeakValueDictionary(), WeakValueDictionary()
+
+
+def _get_functional_registry() -> "Tuple[WeakValueDictionary, WeakValueDictionary]":
+    """Return (spec -> class, token -> class) mappings of enums created with functional API."""
+    return _create_once(FUNCTIONAL_REGISTRY, _create_functional_registry)
+
+
+def _load_enum(spec: "Tuple[Any, ...]", token: "Optional[Tuple[str, int]]" = None) -> "Type[E]":
+    """Find enum created with functional API by its token, or create it again from its spec
+    if not found (e.g. in another process). Enums created again are saved under the same token.
+    """
+    functional_enums, functional_tokens = _get_functional_registry()
+
+    if token is None:  # pickled before tokens were added
+        try:
+            return functional_enums[spec]
+
+        except (KeyError, TypeError):  # not found or not hashable
+            pass
+
+    else:
+        enum_class = functional_tokens.get(token)
+
+        if enum_class is not None:
+            return enum_class
+
+    enum_type, class_name, names, module, qualname, type = spec
+
+    enum_class = enum_type.create(class_name, names, module=module, qualname=qualname, type=type)
+
+    if token is not None:
+        enum_class._token = token
+        functional_tokens[token] = enum_class
+
+    return enum_class
+
+
+def _reduce_enum(
+    enum_class: "Type[E]",
+) -> "Union[str, Tuple[Callable[..., Type[E]], Tuple[Any, ...]]]":
+    """Reduce enum class, using its spec if it was created with functional API
+    and can not be found by its module and qualified name (e.g. was defined in function).
+    """
+    spec = enum_class.__dict__.get("_spec")
+
+    if spec is None or _is_importable(enum_class):
+        return enum_class.__qualname__  # pickle as global
+
+    return _load_enum, (spec, enum_class.__dict__.get("_token"))
+
+
+def _make_readable(entity: "Optional[T]", on_undefined: str = "undefined") -> str:
     if entity is None:
         entity = on_undefined
 
@@ -257,24 +403,962 @@ def _make_readable(entity: Optional[T], on_undefined: str = "undefined") -> str:
     return name
 
 
+class MemberSnapshot:
+    """Published member tables of an enum class, along with tables derived from them.
+
+    Snapshots are never mutated (except for filling derived caches, see _get_cached()),
+    and are published with a single store to the _tables attribute of the class,
+    so all tables read from one snapshot are consistent with each other.
+
+    For fast lookups, tables are also mirrored to class attributes (_member_map, _value_map,
+    _member_tuple and others) after the snapshot is published. Each of these is consistent
+    on its own, but two of them read one after another can come from different snapshots,
+    so code that combines several tables should read them from one snapshot instead.
+    """
+
+    __slots__ = (
+        "enum_class",
+        "member_names",
+        "member_values",
+        "member_map",
+        "member_proxy",
+        "value_map",
+        "member_tuple",
+        "member_tuple_reversed",
+        "indexes",
+        "unique_indexes",
+        "cache",
+    )
+
+    def __init__(
+        self,
+        enum_class: "Type[E]",
+        member_names: "List[str]",
+        member_values: "List[T]",
+        member_map: "Dict[str, E]",
+        member_proxy: "Mapping[str, E]",
+        value_map: "Dict[T, E]",
+        member_tuple: "Tuple[E, ...]",
+        member_tuple_reversed: "Tuple[E, ...]",
+        indexes: "Dict[str, Dict[Any, Tuple[E, ...]]]",
+        unique_indexes: "FrozenSet[str]",
+        cache: "Dict[str, Any]",
+    ) -> None:
+        self.enum_class = enum_class
+        self.member_names = member_names
+        self.member_values = member_values
+        self.member_map = member_map
+        self.member_proxy = member_proxy
+        self.value_map = value_map
+        self.member_tuple = member_tuple
+        self.member_tuple_reversed = member_tuple_reversed
+        self.indexes = indexes
+        self.unique_indexes = unique_indexes
+        self.cache = cache  # derived tables, see _get_cached()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} of {self.enum_class!r}: {len(self.member_tuple)}>"
+
+    def get_cached(self, key: str, build: "Callable[[MemberSnapshot], T]") -> "T":
+        """Fetch derived structure from the cache, building it from this snapshot if needed."""
+        cache = self.cache
+
+        try:
+            return cache[key]
+
+        except KeyError:
+            result = cache[key] = build(self)
+            return result
+
+
+class MemberTables:
+    """Working set of enum member tables (names, values, name -> member and value -> member).
+
+    Tables of created enums are never mutated in place. Instead, writers take the class lock,
+    copy the tables, apply their changes to the copies and publish them back as new snapshot
+    (see MemberSnapshot), so that readers can use tables they have fetched without any locking.
+    """
+
+    def __init__(
+        self,
+        member_names: "Optional[List[str]]" = None,
+        member_values: "Optional[List[T]]" = None,
+        member_map: "Optional[Dict[str, E]]" = None,
+        value_map: "Optional[Dict[T, E]]" = None,
+        indexes: "Optional[Dict[str, Dict[Any, List[E]]]]" = None,
+        unique_indexes: "FrozenSet[str]" = frozenset(),
+    ) -> None:
+        self.member_names: List[str] = [] if member_names is None else member_names
+        self.member_values: List[T] = [] if member_values is None else member_values
+        self.member_map: Dict[str, E] = {} if member_map is None else member_map
+        self.value_map: Dict[T, E] = {} if value_map is None else value_map
+
+        # attribute -> (attribute value -> members) secondary indexes, see EnumMeta.index_by()
+        self.indexes: Dict[str, Dict[Any, List[E]]] = {} if indexes is None else indexes
+        self.unique_indexes = unique_indexes
+
+        # value -> canonical member index used to resolve aliases, built on first use;
+        # members with unhashable values can not be indexed, so they are kept in a list
+        self.canonical_map: Optional[Dict[T, E]] = None
+        self.unhashable_members: List[E] = []
+
+        # name -> member class attributes to set once tables are published
+        self.attributes: Dict[str, E] = {}
+
+        self.alias_scan_time = 0.0  # recorded only if creation of enums is profiled
+
+    @classmethod
+    def copy_from(cls, enum_class: "Type[E]", copy_names: bool = True) -> "MemberTables":
+        """Copy tables of the given enum class. Should be called while holding its lock.
+
+        If copy_names is false, name tables are shared with the class,
+        therefore only nameless members (composite flags) can be added to the copy.
+        """
+        snapshot = enum_class._tables
+
+        member_names, member_map = snapshot.member_names, snapshot.member_map
+
+        indexes: Optional[Dict[str, Dict[Any, List[E]]]] = None
+
+        if copy_names:
+            member_names, member_map = list(member_names), dict(member_map)
+
+            indexes = {
+                attribute: {key: list(members) for key, members in index.items()}
+                for attribute, index in snapshot.indexes.items()
+            }
+
+        return cls(
+            member_names,
+            list(snapshot.member_values),
+            member_map,
+            dict(snapshot.value_map),
+            indexes,
+            snapshot.unique_indexes,
+        )
+
+    def find_canonical(self, value: "T") -> "Optional[E]":
+        """Find canonical member that has the given value, if there is one."""
+        if self.canonical_map is None:
+            self.canonical_map = {}
+
+            for name in self.member_names:
+                self.add_canonical(self.member_map[name])
+
+        try:
+            canonical_member = self.canonical_map.get(value)
+
+        except TypeError:  # not hashable, compare with all members
+            return next(
+                (
+                    self.member_map[name]
+                    for name in self.member_names
+                    if self.member_map[name]._value == value
+                ),
+                None,
+            )
+
+        if canonical_member is None:
+            for member in self.unhashable_members:
+                if member._value == value:
+                    return member
+
+        return canonical_member
+
+    def add_canonical(self, member: "E") -> None:
+        """Add canonical member to the index used by find_canonical()."""
+        if self.canonical_map is None:  # index is going to include the member once built
+            return
+
+        try:
+            self.canonical_map.setdefault(member._value, member)
+
+        except TypeError:  # not hashable
+            self.unhashable_members.append(member)
+
+    def add_index(self, attribute: str, unique: bool = False) -> None:
+        """Add secondary index by the given attribute, indexing existing members."""
+        self.indexes[attribute] = {}
+
+        if unique:
+            self.unique_indexes = self.unique_indexes | {attribute}
+
+        for name in self.member_names:
+            self.index_member(self.member_map[name], (attribute,))
+
+    def index_member(self, member: "E", attributes: "Optional[Iterable[str]]" = None) -> None:
+        """Add canonical member to secondary indexes (all of them, if attributes are not given).
+        Raises ValueError if member violates uniqueness of any index.
+        """
+        if attributes is None:
+            attributes = self.indexes
+
+        for attribute in attributes:
+            index = self.indexes[attribute]
+            key = getattr(member, attribute)
+
+            try:
+                members = index.setdefault(key, [])
+
+            except TypeError:  # not hashable
+                raise TypeError(
+                    f"Can not index {member!r} by unhashable {attribute} value: {key!r}."
+                ) from None
+
+            if members and attribute in self.unique_indexes:
+                raise ValueError(
+                    f"{attribute} value {key!r} of {member!r} is already used by {members[0]!r}."
+                )
+
+            members.append(member)
+
+    def publish(self, enum_class: "Type[E]") -> None:
+        """Publish these tables as new snapshot of the given enum class (see MemberSnapshot),
+        then mirror them to class attributes and set new members as class attributes.
+
+        If only nameless members were added, the snapshot shares name tables and derived caches
+        with the previous one; otherwise member tuples and member map proxy are rebuilt.
+        """
+        member_map = self.member_map
+        previous = enum_class.__dict__.get("_tables")
+
+        if previous is not None and member_map is previous.member_map:  # nameless members only
+            snapshot = MemberSnapshot(
+                enum_class,
+                previous.member_names,
+                self.member_values,
+                member_map,
+                previous.member_proxy,
+                self.value_map,
+                previous.member_tuple,
+                previous.member_tuple_reversed,
+                previous.indexes,
+                previous.unique_indexes,
+                previous.cache,  # derived caches do not depend on nameless members
+            )
+
+        else:
+            member_tuple = tuple(member_map[name] for name in self.member_names)
+
+            snapshot = MemberSnapshot(
+                enum_class,
+                self.member_names,
+                self.member_values,
+                member_map,
+                MappingProxyType(member_map),
+                self.value_map,
+                member_tuple,
+                member_tuple[::-1],
+                {
+                    attribute: {key: tuple(members) for key, members in index.items()}
+                    for attribute, index in self.indexes.items()
+                },
+                self.unique_indexes,
+                {},
+            )
+
+        enum_class._tables = snapshot  # the only store that publishes tables
+
+        # mirrors for lookups that use one table only, see MemberSnapshot
+        enum_class._value_map = snapshot.value_map
+        enum_class._member_map = snapshot.member_map
+        enum_class._member_proxy = snapshot.member_proxy
+        enum_class._member_values = snapshot.member_values
+        enum_class._member_names = snapshot.member_names
+        enum_class._member_tuple = snapshot.member_tuple
+        enum_class._member_tuple_reversed = snapshot.member_tuple_reversed
+        enum_class._indexes = snapshot.indexes
+        enum_class._unique_indexes = snapshot.unique_indexes
+
+        # members are found by __getattr__ until then, so they are never found partially added;
+        # bypass EnumMeta.__setattr__, since it blocks setting names of members
+        for name, member in self.attributes.items():
+            type.__setattr__(enum_class, name, member)
+
+
+def _get_cached(enum_class: "Type[E]", key: str, build: "Callable[[MemberSnapshot], T]") -> "T":
+    """Fetch derived structure from the cache of the current snapshot of the enum class,
+    building it from the snapshot if needed, so that it is never built from mixed tables.
+    """
+    return enum_class._tables.get_cached(key, build)
+
+
+def _build_dict(tables: "MemberSnapshot") -> "Dict[Any, Any]":
+    return {}
+
+
+def _build_lower_names(tables: "MemberSnapshot") -> "Dict[str, E]":
+    return {_lower_name(name): member for name, member in tables.member_map.items()}
+
+
+def _make_frozen_from_name(lower_names: "Dict[str, E]") -> "Callable[[str], E]":
+    def from_name(name: str) -> "E":
+        """CI (case insensitive) member by name lookup, using prebuilt table of frozen enum."""
+        return lower_names[name.lower().replace("_", "")]  # same as _lower_name(name)
+
+    return from_name
+
+
+def _install_from_name(enum_class: "Type[E]") -> None:
+    """Install from_name() that counts lookups if the enum class is instrumented,
+    or one bound to prebuilt table if it is frozen, or restore the default one otherwise.
+    Should be called while holding its lock.
+    """
+    if "from_name" in enum_class._member_map:  # shadowed by the member anyway
+        return
+
+    if enum_class._stats is not None:
+        type.__setattr__(enum_class, "from_name", classmethod(_instrumented_from_name))
+
+    # only enums with members are bound, since enums without them can still be subclassed
+    elif enum_class.enum_frozen and enum_class._member_names:
+        lower_names = _get_cached(enum_class, "lower_names", _build_lower_names)
+
+        type.__setattr__(
+            enum_class, "from_name", staticmethod(_make_frozen_from_name(lower_names))
+        )
+
+    elif "from_name" in enum_class.__dict__:
+        type.__delattr__(enum_class, "from_name")
+
+
+def _build_folded_values(tables: "MemberSnapshot") -> "Dict[str, E]":
+    folded_values: Dict[str, E] = {}
+
+    for member in tables.member_tuple:  # first member wins if several values fold the same
+        folded_values.setdefault(member._value.casefold(), member)
+
+    return folded_values
+
+
+def _build_bit_members(tables: "MemberSnapshot") -> "Tuple[Dict[int, E], int]":
+    # bit -> member table for members that have exactly one bit set, along with mask of these bits
+    bit_members = {}
+    bits = 0
+
+    for member in tables.member_tuple:
+        value = member._value
+
+        if value > 0 and not value & (value - 1):  # power of two
+            bit_members[value] = member
+            bits |= value
+
+    return bit_members, bits
+
+
+def _build_mask(tables: "MemberSnapshot") -> int:
+    # mask of all bits that are valid in the flag
+    mask = 0
+
+    for member in tables.member_tuple:
+        mask |= member._value
+
+    return mask
+
+
+def _flag_overflow(flag: "Type[E]") -> "ValueError":
+    return ValueError(
+        f"Values of {flag.__name__} have to fit in {FLAG_PACK_BITS} bits to be packed "
+        "as signed 64-bit values."
+    )
+
+
+def _get_typecode(tables: "MemberSnapshot") -> str:
+    # see EnumMeta.get_typecode()
+    enum_class = tables.enum_class
+
+    if issubclass(enum_class, Flag):
+        if tables.get_cached("mask", _build_mask).bit_length() > FLAG_PACK_BITS:
+            raise _flag_overflow(enum_class)
+
+        return "q"
+
+    count = len(tables.member_tuple)
+
+    if count <= 0x100:
+        return "B"
+
+    if count <= 0x10000:
+        return "H"
+
+    return "I"
+
+
+def _build_memo(tables: "MemberSnapshot") -> "Dict[Any, E]":
+    return {}  # filled by users of the memo, up to MEMO_SIZE entries
+
+
+def _build_as_dict(tables: "MemberSnapshot") -> "Dict[str, T]":
+    return {name.casefold(): member.value for name, member in tables.member_map.items()}
+
+
+def _build_ordinals(tables: "MemberSnapshot") -> "Dict[str, int]":
+    # aliases map to ordinals of their canonical members
+    ordinals = {member._name: ordinal for ordinal, member in enumerate(tables.member_tuple)}
+    return {name: ordinals[member._name] for name, member in tables.member_map.items()}
+
+
+def _build_name_codes(tables: "MemberSnapshot") -> "Dict[str, int]":
+    if issubclass(tables.enum_class, Flag):
+        return {name: member._value for name, member in tables.member_map.items()}
+
+    return tables.get_cached("ordinals", _build_ordinals)
+
+
+def _build_value_codes(tables: "MemberSnapshot") -> "Dict[Any, int]":
+    if issubclass(tables.enum_class, Flag):  # caches are shared with snapshots adding composites
+        return {member._value: member._value for member in tables.member_map.values()}
+
+    ordinals = tables.get_cached("ordinals", _build_ordinals)
+
+    return {value: ordinals[member._name] for value, member in tables.value_map.items()}
+
+
+def _convert_range(
+    path: str,
+    start: int,
+    end: int,
+    codes_by_token: "Dict[Any, int]",
+    convert: "Optional[Callable[[str], Any]]",
+    encoding: str,
+    typecode: str,
+) -> "Tuple[bytes, List[Tuple[int, str]]]":
+    """Convert lines starting within [start, end) byte range of the file into codes,
+    see EnumMeta.convert_file(). Runs in worker processes, so it only uses lookup tables.
+    Returns packed codes along with (index, token) pairs of tokens that were not found.
+    """
+    from array import array
+
+    codes = array(typecode)
+    append = codes.append
+    lookup = codes_by_token.get
+
+    missing: List[Tuple[int, str]] = []
+
+    with open(path, "rb") as file:
+        if start:
+            file.seek(start - 1)
+            file.readline()  # skip the line that started in the previous range, if any
+
+        position = file.tell()
+
+        while position < end:
+            line = file.readline()
+
+            if not line:
+                break
+
+            position += len(line)
+
+            token = line.decode(encoding).strip()
+
+            try:
+                code = lookup(token if convert is None else convert(token))
+
+            except Exception:  # noqa
+                code = None
+
+            if code is None:
+                missing.append((len(codes), token))
+                code = 0
+
+            append(code)
+
+    return codes.tobytes(), missing
+
+
+class PackedMembers:
+    """Sequence of members that lazily decodes them from codes in the given memoryview.
+    See EnumMeta.pack() and EnumMeta.unpack().
+
+    Sequence methods are implemented directly instead of deriving from collections.abc,
+    which is expensive to import.
+    """
+
+    def __init__(self, enum_class: "Type[E]", view: "memoryview") -> None:
+        self.enum_class = enum_class
+        self.view = view
+
+        if view.format == "q":  # flag values
+            self._decode = enum_class
+        else:  # ordinals of members
+            self._decode = enum_class._member_tuple.__getitem__
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} of {self.enum_class!r}: {len(self)}>"
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    def __getitem__(self, index: "Union[int, slice]") -> "Union[E, PackedMembers]":
+        if isinstance(index, slice):
+            return self.__class__(self.enum_class, self.view[index])
+
+        return self._decode(self.view[index])
+
+    def __iter__(self) -> "Iterator[E]":
+        return map(self._decode, self.view)
+
+    def __reversed__(self) -> "Iterator[E]":
+        return map(self._decode, reversed(self.view.tolist()))
+
+    def __contains__(self, member: "Any") -> bool:
+        return any(item is member or item == member for item in self)
+
+    def index(self, member: "E") -> int:
+        """Return index of the first occurrence of the member, raising ValueError if not found."""
+        for index, item in enumerate(self):
+            if item is member or item == member:
+                return index
+
+        raise ValueError(f"{member!r} is not in {self!r}.")
+
+    def count(self, member: "E") -> int:
+        """Return number of occurrences of the member."""
+        return sum(item is member or item == member for item in self)
+
+    def __enter__(self) -> "PackedMembers":
+        return self
+
+    def __exit__(self, error_type: "Any", error: "Any", traceback: "Any") -> None:
+        self.release()
+
+    def release(self) -> None:
+        """Release underlying memoryview, allowing to close or resize the buffer it points to."""
+        self.view.release()
+
+
+def _get_shared_memory_type() -> "Type[Any]":
+    try:
+        from multiprocessing.shared_memory import SharedMemory
+
+    except ImportError:  # pragma: no cover
+        raise RuntimeError("Shared memory requires Python 3.8 or newer.") from None
+
+    return SharedMemory
+
+
+def _untracks_on_attach(memory: "Any") -> bool:
+    # before Python 3.13 resource tracker is always used on POSIX, and attaching unregisters
+    # segments from it, see _attach_shared_members(); since the tracker can be shared with
+    # the owner (say, by its pool workers or itself), owners register segments again on unlink
+    return os.name == "posix" and not hasattr(memory, "_track")
+
+
+def _close_shared_memory(memory: "Any", unlink: bool) -> None:
+    try:
+        memory.close()
+
+    except BufferError:  # some views are still alive, the mapping is closed along with them
+        pass
+
+    if unlink:
+        if _untracks_on_attach(memory):  # attaching could unregister it from shared tracker
+            from multiprocessing import resource_tracker
+
+            resource_tracker.register(memory._name, "shared_memory")  # unlink() unregisters
+
+        try:
+            memory.unlink()
+
+        except FileNotFoundError:  # already unlinked by someone else
+            pass
+
+
+def _attach_shared_members(
+    enum_class: "Type[E]", name: str, length: "Optional[int]", typecode: str
+) -> "SharedMembers":
+    SharedMemory = _get_shared_memory_type()
+
+    try:  # attached segments should not be unlinked by resource tracker of this process
+        memory = SharedMemory(name, track=False)
+
+    except TypeError:  # track was added in Python 3.13, before that attaching registers
+        memory = SharedMemory(name)
+
+        if _untracks_on_attach(memory):
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(memory._name, "shared_memory")
+
+    return SharedMembers(enum_class, memory, length, typecode)
+
+
+class SharedMembers(PackedMembers):
+    """Packed members in shared memory, see EnumMeta.share() and EnumMeta.attach().
+
+    Pickling only sends the name of the shared memory segment, so other processes attach
+    to it without copying. The segment is unlinked by its owner (the object returned
+    from share()) on release(), or when the owner is garbage collected, or on exit.
+    """
+
+    def __init__(
+        self,
+        enum_class: "Type[E]",
+        memory: "Any",
+        length: "Optional[int]",
+        typecode: str,
+        owner: bool = False,
+    ) -> None:
+        from array import array
+
+        itemsize = array(typecode).itemsize
+
+        if length is None:
+            length = memory.size // itemsize
+
+        super().__init__(enum_class, memory.buf[: length * itemsize].cast(typecode))
+
+        self.memory = memory
+        self.name = memory.name
+        self.owner = owner
+
+        from weakref import finalize
+
+        self._finalizer = finalize(self, _close_shared_memory, memory, owner)
+
+    def __reduce__(self) -> "Tuple[Any, ...]":
+        return (
+            _attach_shared_members,
+            (self.enum_class, self.name, len(self), self.view.format),
+        )
+
+    def __getitem__(self, index: "Union[int, slice]") -> "Union[E, PackedMembers]":
+        if isinstance(index, slice):  # slices have to be released before the segment is closed
+            return PackedMembers(self.enum_class, self.view[index])
+
+        return self._decode(self.view[index])
+
+    def release(self) -> None:
+        """Release underlying memoryview and close shared memory, unlinking it if owned."""
+        self.view.release()
+        self._finalizer()
+
+
+class ParseStream:
+    """Lazy iterator over members parsed from tokens, see EnumMeta.parse_stream().
+
+    Number of processed tokens and number of invalid ones are available as count and invalid,
+    along with (index, token) pairs of invalid tokens in errors, if on_error is "collect".
+    """
+
+    BY = ("value", "name", "auto")
+    ON_ERROR = ("raise", "skip", "default", "collect")
+
+    def __init__(
+        self,
+        enum_class: "Type[E]",
+        tokens: "Iterable[Any]",
+        by: str = "value",
+        on_error: str = "raise",
+        default: "Union[E, T]" = null,
+        convert: "Optional[Callable[[Any], T]]" = None,
+        memo_size: int = MEMO_SIZE,
+    ) -> None:
+        if by not in self.BY:
+            raise ValueError(f"Expected by to be one of {self.BY}, got {by!r}.")
+
+        if on_error not in self.ON_ERROR:
+            raise ValueError(f"Expected on_error to be one of {self.ON_ERROR}, got {on_error!r}.")
+
+        if on_error == "default":
+            if default is null:
+                raise ValueError("Expected default to be given when on_error is 'default'.")
+
+            default = enum_class.from_value(default)
+
+        self.enum_class = enum_class
+        self.by = by
+        self.on_error = on_error
+        self.default = default
+        self.convert = convert
+        self.memo_size = memo_size
+
+        self.memo: Dict[Any, E] = {}  # token -> member (or null, if token is invalid)
+
+        self.count = 0
+        self.invalid = 0
+        self.errors: List[Tuple[int, Any]] = []
+
+        self._lookup = getattr(self, f"_lookup_{by}")
+        self._iterator = self._parse(tokens)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} of {self.enum_class!r}: "
+            f"count={self.count}, invalid={self.invalid}>"
+        )
+
+    def __iter__(self) -> "Iterator[E]":
+        return self
+
+    def __next__(self) -> "E":
+        return next(self._iterator)
+
+    def _lookup_value(self, value: "T") -> "E":
+        enum_class = self.enum_class
+
+        try:
+            return enum_class._value_map[value]
+
+        except (KeyError, TypeError):  # go through linear search, composite flags and enum_missing
+            return enum_class(value)
+
+    def _lookup_name(self, name: str) -> "E":
+        enum_class = self.enum_class
+
+        try:
+            return enum_class._member_map[name]
+
+        except KeyError:
+            return _get_cached(enum_class, "lower_names", _build_lower_names)[_lower_name(name)]
+
+    def _lookup_auto(self, value: "T") -> "E":
+        if isinstance(value, str):
+            try:
+                return self._lookup_name(value)
+
+            except KeyError:
+                pass
+
+        return self._lookup_value(value)
+
+    def resolve(self, token: "Any") -> "E":
+        """Resolve member from token, returning null if the token is invalid."""
+        memo = self.memo
+
+        try:
+            return memo[token]
+
+        except KeyError:
+            hashable = True
+
+        except TypeError:
+            hashable = False
+
+        try:
+            member = self._lookup(token if self.convert is None else self.convert(token))
+
+        except Exception:  # noqa
+            member = null
+
+        if hashable and len(memo) < self.memo_size:
+            memo[token] = member
+
+        return member
+
+    def _parse(self, tokens: "Iterable[Any]", start: int = 0) -> "Iterator[E]":
+        resolve = self.resolve
+        on_error = self.on_error
+
+        for index, token in enumerate(tokens, start):
+            self.count = index + 1
+
+            member = resolve(token)
+
+            if member is null:
+                self.invalid += 1
+
+                if on_error == "raise":
+                    raise ValueError(
+                        f"{token!r} (at index {index}) is not a valid {self.enum_class.__name__}."
+                    )
+
+                elif on_error == "default":
+                    member = self.default
+
+                else:
+                    if on_error == "collect":
+                        self.errors.append((index, token))
+
+                    continue
+
+            yield member
+
+
+class AsyncParseStream(ParseStream):
+    """Asynchronous iterator over members parsed from asynchronous iterable of tokens,
+    see EnumMeta.aparse(). Tokens are read and converted in batches of batch_size.
+    """
+
+    __iter__ = None  # type: ignore  # not iterable synchronously
+
+    def __init__(
+        self,
+        enum_class: "Type[E]",
+        tokens: "AsyncIterable[Any]",
+        by: str = "value",
+        on_error: str = "raise",
+        default: "Union[E, T]" = null,
+        convert: "Optional[Callable[[Any], T]]" = None,
+        memo_size: int = MEMO_SIZE,
+        batch_size: int = BATCH_SIZE,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError(f"Expected batch_size to be positive, got {batch_size!r}.")
+
+        super().__init__(enum_class, (), by, on_error, default, convert, memo_size)
+
+        self.batch_size = batch_size
+
+        self._async_iterator = self._aparse(tokens)
+
+    def __aiter__(self) -> "AsyncParseStream":
+        return self
+
+    async def __anext__(self) -> "E":
+        return await self._async_iterator.__anext__()
+
+    async def _aparse(self, tokens: "AsyncIterable[Any]") -> "AsyncIterator[E]":
+        batch_size = self.batch_size
+
+        batch: List[Any] = []
+        start = 0
+
+        async for token in tokens:
+            batch.append(token)
+
+            if len(batch) < batch_size:
+                continue
+
+            # tokens are not read further until members of this batch are consumed
+            for member in self._parse_batch(batch, start):
+                yield member
+
+            start += len(batch)
+            batch = []
+
+        for member in self._parse_batch(batch, start):
+            yield member
+
+    def _parse_batch(self, batch: "List[Any]", start: int) -> "Iterator[E]":
+        members: List[E] = []
+
+        try:  # convert all tokens at once, so that members before invalid token are kept
+            members.extend(self._parse(batch, start))
+
+        except ValueError as error:
+            yield from members
+            raise error
+
+        yield from members
+
+
+class AsyncResolver:
+    """Batching resolver of missing values, see EnumMeta.aresolve().
+
+    Values requested within one event loop iteration are resolved by one enum_resolve() call,
+    and values that are being resolved already are not requested again.
+    """
+
+    def __init__(self, enum_class: "Type[E]", loop: "Any") -> None:
+        self.enum_class = enum_class
+        from weakref import ref
+
+        self._loop = ref(loop)  # resolvers are kept per loop, so they should not keep loops alive
+
+        self.pending: Dict[T, Any] = {}  # value -> future of values being resolved
+        self.batch: List[T] = []  # values that are going to be resolved on next iteration
+        self.tasks: Set[Any] = set()  # running tasks, referenced so they are not collected
+
+    @property
+    def loop(self) -> "Any":
+        return self._loop()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} of {self.enum_class!r}: pending={len(self.pending)}>"
+
+    def request(self, value: "T") -> "Any":
+        """Return future of member with the given value, requesting it if needed."""
+        future = self.pending.get(value)
+
+        if future is None:
+            future = self.pending[value] = self.loop.create_future()
+
+            if not self.batch:  # first value in this iteration, schedule resolving the batch
+                self.loop.call_soon(self.flush)
+
+            self.batch.append(value)
+
+        return future
+
+    def flush(self) -> None:
+        """Start resolving requested values."""
+        batch, self.batch = self.batch, []
+
+        task = self.loop.create_task(self.resolve(batch))
+
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def resolve(self, values: "List[T]") -> None:
+        """Resolve given values with enum_resolve(), adding resolved members."""
+        enum_class = self.enum_class
+
+        try:
+            names = await enum_class.enum_resolve(list(values))
+
+            for value in values:
+                member = enum_class._value_map.get(value)  # could have been added meanwhile
+
+                if member is None:
+                    name = names.get(value)
+
+                    if name is None:
+                        self._set_exception(
+                            value, ValueError(f"{value!r} is not a valid {enum_class.__name__}.")
+                        )
+                        continue
+
+                    try:
+                        member = enum_class.add_member(name, value)
+
+                    except Exception as error:
+                        self._set_exception(value, error)
+                        continue
+
+                future = self.pending.pop(value)
+
+                if not future.done():
+                    future.set_result(member)
+
+        except Exception as error:  # resolver failed, so fail all values that are left
+            for value in values:
+                self._set_exception(value, error)
+
+        finally:  # cancelled, cancel futures of values that are left
+            for value in values:
+                future = self.pending.pop(value, None)
+
+                if future is not None:
+                    future.cancel()
+
+    def _set_exception(self, value: "T", error: "Exception") -> None:
+        future = self.pending.pop(value, None)
+
+        if future is not None and not future.done():
+            future.set_exception(error)
+
+
 def _create_enum_member(
-    member_name: Optional[str],
-    member_type: Type[T],
-    member_value: Union[U, Tuple[U, ...]],
-    enum_class: Type[E],
-    new_function: Callable[..., E],
+    member_name: "Optional[str]",
+    member_type: "Type[T]",
+    member_value: "Union[U, Tuple[U, ...]]",
+    enum_class: "Type[E]",
+    new_function: "Callable[..., E]",
     use_args: bool,
-    dynamic_attributes: Iterable[str],
-) -> E:
-    """Create and add enum member. Setting name to None has special meaning;
+    dynamic_attributes: "Iterable[str]",
+    tables: "MemberTables",
+) -> "E":
+    """Create and add enum member to tables. Setting name to None has special meaning;
     This will attempt to add to value -> member map only;
     Special case is intended for creation of composite flags.
     """
     # double check if already defined, and raise error in that case
     if member_name is not None:
-        if member_name in enum_class._member_map:
+        if member_name in tables.member_map:
             raise ValueError(
-                f"{member_name!r} already defined as: {enum_class._member_map[member_name]!r}."
+                f"{member_name!r} already defined as: {tables.member_map[member_name]!r}."
             )
 
     if not isinstance(member_value, tuple):  # wrap in tuple if not already one
@@ -293,6 +1377,9 @@ def _create_enum_member(
             if member_type is not object:
                 member_value = member_type(*args)
 
+                if member_type is str:  # intern string values, so that they compare faster
+                    member_value = sys.intern(member_value)
+
             enum_member._value = member_value
 
     else:
@@ -301,32 +1388,44 @@ def _create_enum_member(
         if not hasattr(enum_member, "_value"):  # if value was not defined previously
             enum_member._value = member_value
 
-    enum_class._member_values.append(member_value)
+    tables.member_values.append(member_value)
 
     enum_member._name = member_name
     enum_member.__objclass__ = enum_class
     enum_member.__init__(*args)
 
     if member_name is not None:
-        for name, canonical_member in enum_class._member_map.items():
-            if canonical_member._value == enum_member._value:
-                enum_member = canonical_member
-                break
+        if PROFILE_CREATION:
+            from time import perf_counter
+
+            started = perf_counter()
+
+        canonical_member = tables.find_canonical(enum_member._value)
+
+        if canonical_member is not None:
+            enum_member = canonical_member
 
         else:
             # aliases should not appear in member names (only in __members__)
-            enum_class._member_names.append(member_name)
+            tables.member_names.append(member_name)
+            tables.add_canonical(enum_member)
+
+            if tables.indexes:
+                tables.index_member(enum_member)
+
+        if PROFILE_CREATION:
+            tables.alias_scan_time += perf_counter() - started
 
         # boost performance for any member that would not shadow DynamicClassAttribute
         if member_name not in dynamic_attributes:
-            setattr(enum_class, member_name, enum_member)
+            tables.attributes[member_name] = enum_member
 
         # now add to member map
-        enum_class._member_map[member_name] = enum_member
+        tables.member_map[member_name] = enum_member
 
     try:
         # see if member with this value exists (we reach here with member_name=None)
-        previous_member = enum_class._value_map.get(member_value)
+        previous_member = tables.value_map.get(member_value)
 
         # see if member exists and has name set to None
         if previous_member is not None and previous_member._name is None:
@@ -335,7 +1434,7 @@ def _create_enum_member(
 
         # attempt to add value to value -> member map in order to make lookups constant, O(1)
         # if value is not hashable, this will fail and our lookups will be linear, O(n)
-        enum_class._value_map.setdefault(member_value, enum_member)  # in order to support threading
+        tables.value_map.setdefault(member_value, enum_member)
 
     except TypeError:  # not hashable
         pass
@@ -344,8 +1443,8 @@ def _create_enum_member(
 
 
 def enum_generate_next_value(
-    name: str, start: Optional[T], count: int, member_values: List[T]
-) -> T:  # pragma: no cover
+    name: str, start: "Optional[T]", count: int, member_values: "List[T]"
+) -> "T":  # pragma: no cover
     """Empty function that shows signature of enum_generate_next_value() functions.
 
     name: str -> Name of enum entry which value should be generated.
@@ -356,7 +1455,9 @@ def enum_generate_next_value(
     raise NotImplementedError
 
 
-def incremental_next_value(name: str, start: Optional[T], count: int, member_values: List[T]) -> T:
+def incremental_next_value(
+    name: str, start: "Optional[T]", count: int, member_values: "List[T]"
+) -> "T":
     """Implementation of enum_generate_next_value()
     that automatically increments last possible member value.
 
@@ -376,7 +1477,16 @@ def incremental_next_value(name: str, start: Optional[T], count: int, member_val
         return start
 
 
-def strict_bit_next_value(name: str, start: Optional[T], count: int, member_values: List[T]) -> T:
+def lower_name_next_value(
+    name: str, start: "Optional[T]", count: int, member_values: "List[T]"
+) -> "T":
+    """Implementation of enum_generate_next_value() that returns name of the member, lowercased."""
+    return name.lower()
+
+
+def strict_bit_next_value(
+    name: str, start: "Optional[T]", count: int, member_values: "List[T]"
+) -> "T":
     """Implementation of enum_generate_next_value()
     that automatically generates next power of two after previous value.
 
@@ -398,21 +1508,34 @@ def strict_bit_next_value(name: str, start: Optional[T], count: int, member_valu
         return start
 
 
-class EnumDict(Dict[str, U]):
+class EnumDict(dict):
     def __init__(self) -> None:
         super().__init__()
 
         self._auto_on_missing: bool = False
+        self._frozen: bool = False
+        self._compact_pickle: bool = False
         self._start: Optional[T] = None
         self._enum_generate_next_value: Optional[Callable[..., T]] = None
         self._member_names: List[str] = []
         self._member_values: List[T] = []
         self._ignore: List[str] = []
+        self._indexes: Dict[str, bool] = {}
+
+        # recorded only if creation of enums is profiled, see EnumMeta.__prepare__
+        self._prepare_started: float = 0.0
+        self._prepared: float = 0.0
 
-    def __setitem__(self, key: str, value: U) -> None:
+    def __setitem__(self, key: str, value: "U") -> None:
         if key == "enum_auto_on_missing":
             self._auto_on_missing = bool(value)
 
+        elif key == "enum_frozen":
+            value = self._frozen = bool(value)
+
+        elif key == "enum_compact_pickle":
+            value = self._compact_pickle = bool(value)
+
         elif key == "enum_ignore":
             if isinstance(value, str):  # process enum_ignore if given a string
                 ignore = filter(bool, value.replace(",", " ").split())
@@ -422,13 +1545,23 @@ class EnumDict(Dict[str, U]):
 
             self._ignore = list(ignore)
 
+        elif key == "enum_indexes":
+            if isinstance(value, str):  # process enum_indexes if given a string
+                value = filter(bool, value.replace(",", " ").split())
+
+            if hasattr(value, "keys"):  # attribute -> unique mapping
+                value = self._indexes = dict(value)
+
+            else:
+                value = self._indexes = dict.fromkeys(value, False)
+
         elif key == "enum_generate_next_value":  # setting enum_generate_next_value() function
             self._enum_generate_next_value = value
 
         elif key == "enum_start":
             self._start = value
 
-        elif key in self._member_names:
+        elif key in self and key in self._member_names:  # member names are always keys
             # something overrides enum?
             raise ValueError(f"Attempt to reuse key: {key!r}.")
 
@@ -448,22 +1581,131 @@ class EnumDict(Dict[str, U]):
                             "enum_generate_next_value was not defined."
                         )
 
-                    value.value = self._enum_generate_next_value(
-                        key, self._start, len(self._member_names), self._member_values.copy()
-                    )
+                    # values are only used to generate next values, so there is no need to copy them
+                    value.value = self._enum_generate_next_value(
+                        key, self._start, len(self._member_names), self._member_values
+                    )
+
+                value = value.value
+
+            self._member_names.append(key)
+            self._member_values.append(value)
+
+        super().__setitem__(key, value)
+
+    def __missing__(self, key: str) -> None:
+        if _is_strict_dunder(key) or not self._auto_on_missing:
+            raise KeyError(key)
+
+        self[key] = auto()
+
+
+class CreationProfile:
+    """Profile of enum class creation, see profile_creation(). Times are in seconds.
+
+    module: str -> Module of the class.
+    qualname: str -> Qualified name of the class.
+    member_count: int -> Count of unique members.
+    alias_count: int -> Count of aliases.
+    total_time: float -> Time from start of EnumMeta.__prepare__ to end of EnumMeta.__new__,
+        including class body.
+    body_time: float -> Time taken to execute class body (or to fill dict, for functional API).
+    resolve_time: float -> Time taken to find data type, enum type and __new__ of members.
+    member_time: float -> Time taken to create members, including alias scans.
+    alias_scan_time: float -> Time taken to scan for aliases.
+    """
+
+    __slots__ = (
+        "module",
+        "qualname",
+        "member_count",
+        "alias_count",
+        "total_time",
+        "body_time",
+        "resolve_time",
+        "member_time",
+        "alias_scan_time",
+    )
+
+    def __init__(self, **attributes: "Any") -> None:
+        for name in self.__slots__:
+            setattr(self, name, attributes.get(name, 0))
+
+    def __repr__(self) -> str:
+        return "<{} {}>".format(
+            self.__class__.__name__,
+            " ".join(f"{name}={value!r}" for name, value in self.as_dict().items()),
+        )
 
-                value = value.value
+    def as_dict(self) -> "Dict[str, Union[str, int, float]]":
+        return {name: getattr(self, name) for name in self.__slots__}
 
-            self._member_names.append(key)
-            self._member_values.append(value)
 
-        super().__setitem__(key, value)
+CREATION_PROFILES: "List[CreationProfile]" = []
 
-    def __missing__(self, key: str) -> None:
-        if _is_strict_dunder(key) or not self._auto_on_missing:
-            raise KeyError(key)
 
-        self[key] = auto()
+def profile_creation(enabled: bool = True) -> None:
+    """Enable (or disable) profiling of enum creation, see creation_report().
+    Setting ENUMS_PROFILE_CREATION environment variable enables profiling on import,
+    printing the report to standard error on exit.
+    """
+    global PROFILE_CREATION
+
+    PROFILE_CREATION = enabled
+
+
+def creation_report(key: str = "total_time") -> "List[CreationProfile]":
+    """Return profiles of created enums, sorted by the given key, descending."""
+    if key not in CreationProfile.__slots__:
+        raise ValueError(f"Expected key to be one of {CreationProfile.__slots__}, got {key!r}.")
+
+    return sorted(CREATION_PROFILES, key=lambda profile: getattr(profile, key), reverse=True)
+
+
+def print_creation_report(
+    key: str = "total_time", limit: "Optional[int]" = None, file: "Optional[Any]" = None
+) -> None:
+    """Print profiles of created enums (optionally only first limit of them), sorted by key."""
+    if file is None:
+        file = sys.stderr
+
+    profiles = creation_report(key)[:limit]
+
+    print(
+        "{:>10} {:>10} {:>10} {:>10} {:>10} {:>8} {:>8}  {}".format(
+            "total_ms",
+            "body_ms",
+            "resolve_ms",
+            "member_ms",
+            "alias_ms",
+            "members",
+            "aliases",
+            "enum",
+        ),
+        file=file,
+    )
+
+    for profile in profiles:
+        print(
+            "{:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f} {:>8} {:>8}  {}.{}".format(
+                profile.total_time * 1000,
+                profile.body_time * 1000,
+                profile.resolve_time * 1000,
+                profile.member_time * 1000,
+                profile.alias_scan_time * 1000,
+                profile.member_count,
+                profile.alias_count,
+                profile.module,
+                profile.qualname,
+            ),
+            file=file,
+        )
+
+
+if PROFILE_CREATION:  # pragma: no cover
+    import atexit
+
+    atexit.register(print_creation_report)
 
 
 class EnumMeta(type):
@@ -471,42 +1713,67 @@ class EnumMeta(type):
     def __prepare__(
         meta_cls,
         cls: str,
-        bases: Tuple[Type[Any], ...],
+        bases: "Tuple[Type[Any], ...]",
         *,
         auto_on_missing: bool = False,
-        ignore: Optional[Union[str, Iterable[str]]] = None,
-        start: Optional[U] = None,
+        compact_pickle: bool = False,
+        frozen: bool = False,
+        ignore: "Optional[Union[str, Iterable[str]]]" = None,
+        indexes: "Optional[Union[str, Iterable[str], Dict[str, bool]]]" = None,
+        start: "Optional[U]" = None,
         **kwargs,
-    ) -> EnumDict:
+    ) -> "EnumDict":
         """Prepare class initialization."""
+        if PROFILE_CREATION:
+            from time import perf_counter
+
+            started = perf_counter()
+
         enum_dict = EnumDict()
 
         _, enum_type = meta_cls._get_member_and_enum_type(bases)
 
         for key, value in dict(
             enum_auto_on_missing=auto_on_missing,
+            enum_compact_pickle=compact_pickle,
+            enum_frozen=frozen,
             enum_generate_next_value=getattr(enum_type, "enum_generate_next_value", None),
             enum_ignore=(ignore or []),
+            enum_indexes=(indexes or ()),
             enum_start=start,
         ).items():
             enum_dict[key] = value
 
+        if PROFILE_CREATION:
+            enum_dict._prepare_started = started
+            enum_dict._prepared = perf_counter()
+
         return enum_dict
 
     def __new__(
         meta_cls,
         cls: str,
-        bases: Tuple[Type[Any], ...],
-        cls_dict: EnumDict,
+        bases: "Tuple[Type[Any], ...]",
+        cls_dict: "EnumDict",
         *,
         # these are used by our meta_cls.__prepare__(...)
         auto_on_missing: bool = False,
-        ignore: Optional[Union[str, Iterable[str]]] = None,
-        start: Optional[U] = None,
-    ) -> Type[E]:
+        compact_pickle: bool = False,
+        frozen: bool = False,
+        ignore: "Optional[Union[str, Iterable[str]]]" = None,
+        indexes: "Optional[Union[str, Iterable[str], Dict[str, bool]]]" = None,
+        start: "Optional[U]" = None,
+    ) -> "Type[E]":
         """Initialize new class. This function is *very* magical."""
         global ENUM_DEFINED  # alright, magical things here
 
+        started: Optional[float] = None
+
+        if INSTRUMENT_ENUMS or PROFILE_CREATION:
+            from time import perf_counter
+
+            started = perf_counter()
+
         # add enum_ignore to self
         enum_ignore = list(cls_dict.get("enum_ignore", []))
         enum_ignore.append("enum_ignore")
@@ -519,6 +1786,9 @@ class EnumMeta(type):
             cls_dict, member_type, enum_type
         )
 
+        if started is not None:
+            resolved = perf_counter()
+
         # save all members into separate mapping
         enum_members = {name: cls_dict[name] for name in cls_dict._member_names}
         # remove enum members so they don't get baked into new class
@@ -534,34 +1804,38 @@ class EnumMeta(type):
         # add default documentation if we need to
         cls_dict.setdefault("__doc__", DEFAULT_DOCUMENTATION)
 
-        if "__reduce_ex__" not in cls_dict:
+        # members of compact pickle enums are pickled by name, so their data type does not matter
+        if "__reduce_ex__" not in cls_dict and not cls_dict._compact_pickle:
             if member_type is not object:
                 member_type_dict = member_type.__dict__
 
                 if not any(method_name in member_type_dict for method_name in PICKLE_METHODS):
                     _make_class_dict_unpicklable(cls_dict)
 
-        # create dummy enum class to manipulate MRO
-        dummy_enum_class = super().__new__(meta_cls, cls, bases, EnumDict())
+        # object always comes last in MRO, so there is nothing to manipulate for pure enums;
+        # skipping that also makes creating base classes (Enum, Flag) on import cheaper
+        if member_type is not object:
+            # create dummy enum class to manipulate MRO
+            dummy_enum_class = super().__new__(meta_cls, cls, bases, EnumDict())
 
-        mro = list(dummy_enum_class.mro())
+            mro = list(dummy_enum_class.mro())
 
-        try:
-            mro.remove(dummy_enum_class)
+            try:
+                mro.remove(dummy_enum_class)
 
-        except ValueError:  # pragma: no cover
-            pass
+            except ValueError:  # pragma: no cover
+                pass
 
-        try:
-            if mro.index(member_type) < mro.index(enum_type):
-                # we need to preserve enum_type functions
-                mro.remove(enum_type)
-                mro.insert(mro.index(member_type), enum_type)
+            try:
+                if mro.index(member_type) < mro.index(enum_type):
+                    # we need to preserve enum_type functions
+                    mro.remove(enum_type)
+                    mro.insert(mro.index(member_type), enum_type)
 
-        except ValueError:  # pragma: no cover
-            pass
+            except ValueError:  # pragma: no cover
+                pass
 
-        bases = tuple(mro)  # now back to tuple
+            bases = tuple(mro)  # now back to tuple
 
         # create our new class
         enum_class = super().__new__(meta_cls, cls, bases, cls_dict)
@@ -577,16 +1851,23 @@ class EnumMeta(type):
             if type_method is not None and type_method is class_method:
                 setattr(enum_class, name, enum_method)
 
-        # add member names list and member type, along with new_func and new_use_args
-        enum_class._member_names: List[str] = []  # list of member names
-        enum_class._member_values: List[T] = []  # list of member values
+        # add member type, along with new_func and new_use_args
         enum_class._member_type = member_type  # member type
         enum_class._new_function = new_func
         enum_class._use_args = new_use_args
 
-        # add member maps
-        enum_class._member_map: Dict[str, E] = {}  # name -> member map
-        enum_class._value_map: Dict[T, E] = {}  # value -> member map for hashable values
+        # holder of lock that serializes writers (add_member, update and composite creation),
+        # which is created by the first writer, see _get_lock()
+        enum_class._lock_holder = []
+
+        enum_class._stats = None  # lookup stats, see instrument()
+
+        # the class is not visible to anyone else yet, so we can fill tables in place
+        # instead of copying them on each member, and publish them once we are done
+        tables = MemberTables()
+
+        for attribute, unique in cls_dict._indexes.items():
+            tables.add_index(attribute, unique)
 
         # save DynamicClassAttribute attributes from super classes so we know if
         # we can take the shortcut of storing members in the class dict
@@ -598,6 +1879,9 @@ class EnumMeta(type):
         }
         enum_class._dynamic_attributes = dynamic_attributes
 
+        if started is not None:
+            members_started = perf_counter()
+
         for member_name in cls_dict._member_names:  # create our fellow enum members
             _create_enum_member(
                 member_name=member_name,
@@ -607,28 +1891,59 @@ class EnumMeta(type):
                 new_function=new_func,
                 use_args=new_use_args,
                 dynamic_attributes=dynamic_attributes,
+                tables=tables,
             )
 
+        tables.publish(enum_class)
+
+        if started is not None:
+            members_created = perf_counter()
+
         if ENUM_DEFINED:  # if enum was created (this will be false on initial run)
             if new_member_save:  # save as new_member if needed
                 enum_class.__new_member__ = new_func
-            enum_class.__new__ = Enum.__new__
+            enum_class.__new__ = ENUM_NEW
 
         else:
             ENUM_DEFINED = True
 
+        if enum_class.enum_frozen:
+            enum_class.freeze()
+
+        if started is not None:
+            created = perf_counter()
+
+            if INSTRUMENT_ENUMS:
+                instrument(enum_class).creation_time = created - started
+
+            # prepare time is not recorded if profiling was enabled after preparing
+            if PROFILE_CREATION and cls_dict._prepared:
+                CREATION_PROFILES.append(
+                    CreationProfile(
+                        module=enum_class.__module__,
+                        qualname=enum_class.__qualname__,
+                        member_count=len(tables.member_names),
+                        alias_count=len(tables.member_map) - len(tables.member_names),
+                        total_time=created - cls_dict._prepare_started,
+                        body_time=started - cls_dict._prepared,
+                        resolve_time=resolved - started,
+                        member_time=members_created - members_started,
+                        alias_scan_time=tables.alias_scan_time,
+                    )
+                )
+
         return enum_class  # finally! ;)
 
     def __call__(
         cls,
-        value: Any,
-        names: Union[str, Dict[str, U], List[str], Tuple[str, ...]] = (),
-        module: Optional[str] = None,
-        qualname: Optional[str] = None,
-        type: Optional[Type[T]] = None,
-        start: Optional[T] = None,
-        **members: Dict[str, U],
-    ) -> Union[E, Type[E]]:
+        value: "Any",
+        names: "Union[str, Dict[str, U], List[str], Tuple[str, ...]]" = (),
+        module: "Optional[str]" = None,
+        qualname: "Optional[str]" = None,
+        type: "Optional[Type[T]]" = None,
+        start: "Optional[T]" = None,
+        **members: "Dict[str, U]",
+    ) -> "Union[E, Type[E]]":
         """With value argument only, search member by value.
         Otherwise, functional API: create new enum class.
         """
@@ -642,15 +1957,19 @@ class EnumMeta(type):
     def create(
         cls,
         class_name: str,
-        names: Union[str, Dict[str, U], List[str], Tuple[str, ...]] = (),
+        names: "Union[str, Dict[str, U], List[str], Tuple[str, ...]]" = (),
         *,
-        module: Optional[str] = None,
-        qualname: Optional[str] = None,
-        type: Optional[Type[T]] = None,
-        start: Optional[T] = None,
-        **members: Dict[str, U],
-    ) -> Type[E]:
-        """Convenient implementation of creating a new enum."""
+        module: "Optional[str]" = None,
+        qualname: "Optional[str]" = None,
+        type: "Optional[Type[T]]" = None,
+        start: "Optional[T]" = None,
+        cached: "Optional[bool]" = None,
+        **members: "Dict[str, U]",
+    ) -> "Type[E]":
+        """Convenient implementation of creating a new enum.
+        If cached is true (defaults to what cache_created() has set), existing enum
+        with the same spec is returned, if there is one.
+        """
         meta_cls = cls.__class__
 
         bases = (cls,) if type is None else (type, cls)
@@ -666,8 +1985,8 @@ class EnumMeta(type):
             member_values = []
 
             for count, name in enumerate(original_names):
-                # generate values
-                value = enum_type.enum_generate_next_value(name, start, count, member_values.copy())
+                # generate values (no need to copy member values, since they are not used otherwise)
+                value = enum_type.enum_generate_next_value(name, start, count, member_values)
 
                 member_values.append(value)
 
@@ -684,7 +2003,8 @@ class EnumMeta(type):
         for member_name, member_value in members.items():
             cls_dict[member_name] = member_value
 
-        enum_class = meta_cls.__new__(meta_cls, class_name, bases, cls_dict)
+        # save members before they are removed from class dict
+        member_items = tuple((name, cls_dict[name]) for name in cls_dict._member_names)
 
         if module is None:
             try:
@@ -694,20 +2014,54 @@ class EnumMeta(type):
                 pass
 
         if module is None:  # pragma: no cover
-            _make_class_unpicklable(enum_class)
+            # we can not pickle the class as global, but we still can pickle it by spec
+            cls_dict["__module__"] = "<unknown>"
 
         else:
-            enum_class.__module__ = module
+            cls_dict["__module__"] = module
 
         if qualname is not None:
-            enum_class.__qualname__ = qualname
+            cls_dict["__qualname__"] = qualname
+
+        # save spec, so that the class can be created again, for instance, when unpickling;
+        # member values are already generated here, so start is accounted for as well
+        spec = (cls, class_name, member_items, module, qualname, type)
+
+        if cached is None:
+            cached = CACHE_CREATED
+
+        functional_enums, functional_tokens = _get_functional_registry()
+
+        if cached:
+            try:
+                enum_class = functional_enums.get(spec)
+
+            except TypeError:  # spec is not hashable
+                enum_class = None
+
+            # members could have been added to the enum after it was created
+            if enum_class is not None and len(enum_class._member_map) == len(member_items):
+                return enum_class
+
+        enum_class = meta_cls.__new__(meta_cls, class_name, bases, cls_dict)
+
+        enum_class._spec = spec
+        enum_class._token = token = (FUNCTIONAL_TOKEN_KEY, next(FUNCTIONAL_TOKEN_COUNTER))
+
+        functional_tokens[token] = enum_class
+
+        try:
+            functional_enums[spec] = enum_class
+
+        except TypeError:  # spec is not hashable
+            pass
 
         return enum_class
 
     def __bool__(cls) -> bool:
         return True  # classes/types should always return True
 
-    def __contains__(cls, member: E) -> bool:
+    def __contains__(cls, member: "E") -> bool:
         if not isinstance(member, Enum):
             raise TypeError(
                 "Unsupported operand type(s) for 'in': '{other_name}' and '{self_name}'".format(
@@ -723,7 +2077,7 @@ class EnumMeta(type):
 
         super().__delattr__(name)
 
-    def __getattr__(cls, name: str) -> E:
+    def __getattr__(cls, name: str) -> "E":
         if _is_strict_dunder(name):
             raise AttributeError(name)
 
@@ -733,26 +2087,26 @@ class EnumMeta(type):
         except KeyError:
             raise AttributeError(name) from None
 
-    def __getitem__(cls, name: str) -> E:
+    def __getitem__(cls, name: str) -> "E":
         return cls._member_map[name]
 
-    def __iter__(cls) -> Iterator[E]:
+    def __iter__(cls) -> "Iterator[E]":
         """Same as cls.get_members()."""
-        return cls.get_members()
+        return iter(cls._member_tuple)
 
-    def __reversed__(cls) -> Iterator[E]:
+    def __reversed__(cls) -> "Iterator[E]":
         """Same as cls.get_members(reverse=True)."""
-        return cls.get_members(reverse=True)
+        return iter(cls._member_tuple_reversed)
 
     def __len__(cls) -> int:
         """Return count of unique members (no aliases)."""
-        return len(cls._member_names)
+        return len(cls._member_tuple)
 
     def __repr__(cls) -> str:
         """Standard-like enum class representation."""
         return f"<enum {cls.__name__!r}>"
 
-    def __setattr__(cls, name: str, value: T) -> None:
+    def __setattr__(cls, name: str, value: "T") -> None:
         """Set new attribute, blocking member reassign attempts.
         To add new fields, consider using Enum.add_member or Enum.update.
         """
@@ -763,12 +2117,12 @@ class EnumMeta(type):
 
         super().__setattr__(name, value)
 
-    def __dir__(cls) -> List[str]:
+    def __dir__(cls) -> "List[str]":
         added_behavior = [key for key in OBJECT_DIR(cls) if not _is_special(key)]
         return DEFAULT_DIR_INCLUDE + added_behavior
 
     @staticmethod
-    def _get_member_and_enum_type(bases: Tuple[Type[Any], ...]) -> Tuple[Type[T], Type[E]]:
+    def _get_member_and_enum_type(bases: "Tuple[Type[Any], ...]") -> "Tuple[Type[T], Type[E]]":
         """Find data type and first enum type that are subclassed."""
         if not bases:  # no bases => nothing to search => return defaultsd
             if ENUM_DEFINED:  # pragma: no cover
@@ -790,8 +2144,8 @@ class EnumMeta(type):
 
     @staticmethod
     def _find_new(
-        cls_dict: EnumDict, member_type: Type[T], enum_type: Type[E]
-    ) -> Tuple[Callable[..., U], bool, bool]:  # new_func, new_member_save, new_use_args
+        cls_dict: "EnumDict", member_type: "Type[T]", enum_type: "Type[E]"
+    ) -> "Tuple[Callable[..., U], bool, bool]":  # new_func, new_member_save, new_use_args
         """Find __new__ function to create member types with."""
         new_func = cls_dict.get("__new__")
 
@@ -802,94 +2156,544 @@ class EnumMeta(type):
                 for possible in (member_type, enum_type):
                     target = getattr(possible, method, None)
 
-                    if target not in USELESS_NEW:
-                        new_func = target
-                        break
+                    if target not in USELESS_NEW:
+                        new_func = target
+                        break
+
+                if new_func is not None:  # assigned in inner loop, break from outer loop
+                    break
+
+            else:
+                new_func = OBJECT_NEW
+
+        else:
+            new_member_save = True
+
+        new_use_args = new_func is not OBJECT_NEW
+
+        return new_func, new_member_save, new_use_args
+
+    def add_member(cls, name: str, value: "T") -> "E":
+        """Add new member to the enum. auto() is allowed."""
+        with _get_lock(cls):
+            if cls.enum_frozen:
+                raise AttributeError(f"Can not add members to frozen enum: {cls!r}.")
+
+            if isinstance(value, auto):
+                if value.value is null:  # if null => generate next value
+                    value.value = cls.enum_generate_next_value(
+                        name, None, len(cls._member_names), cls._member_values.copy()
+                    )
+                value = value.value
+
+            tables = MemberTables.copy_from(cls)
+
+            member = _create_enum_member(
+                member_name=name,
+                member_type=cls._member_type,
+                member_value=value,
+                enum_class=cls,
+                new_function=cls._new_function,
+                use_args=cls._use_args,
+                dynamic_attributes=cls._dynamic_attributes,
+                tables=tables,
+            )
+
+            tables.publish(cls)
+
+        return member
+
+    def update(cls, **name_to_value: "Dict[str, T]") -> None:
+        """Add new member to enum for each name and value in args."""
+        cls.extend(name_to_value)
+
+    def extend(
+        cls,
+        members: "Union[Dict[str, T], Iterable[Tuple[str, T]]]",
+        *,
+        auto_start: "Optional[T]" = None,
+    ) -> "List[E]":
+        """Add new members to the enum from mapping or iterable of (name, value) pairs.
+        auto() is allowed, auto_start is passed to enum_generate_next_value() as start.
+
+        All names are validated before adding any members, and members are published at once,
+        so that either all of them are added or none of them are. Returns added members.
+        """
+        if hasattr(members, "keys"):  # mapping, same as in dict.update()
+            members = members.items()
+
+        items = list(members)
+
+        with _get_lock(cls):  # other writers should not interleave with our members
+            if cls.enum_frozen:
+                raise AttributeError(f"Can not add members to frozen enum: {cls!r}.")
+
+            names: Set[str] = set()
+
+            for name, _ in items:
+                if name in cls._member_map or name in names:
+                    raise ValueError(f"{name!r} already defined.")
+
+                if name in INVALID_ENUM_NAMES:
+                    raise ValueError(f"Invalid member name: {name!r}.")
+
+                names.add(name)
+
+            tables = MemberTables.copy_from(cls)
+            member_values: Optional[List[T]] = None  # copied once, if auto() is used
+
+            added = []
+
+            # nothing is visible until tables are published, so failures leave the enum as is
+            for name, value in items:
+                if isinstance(value, auto):
+                    if value.value is null:  # if null => generate next value
+                        if member_values is None:
+                            member_values = list(tables.member_values)
+
+                        value.value = cls.enum_generate_next_value(
+                            name, auto_start, len(tables.member_names), member_values
+                        )
+                    value = value.value
+
+                added.append(
+                    _create_enum_member(
+                        member_name=name,
+                        member_type=cls._member_type,
+                        member_value=value,
+                        enum_class=cls,
+                        new_function=cls._new_function,
+                        use_args=cls._use_args,
+                        dynamic_attributes=cls._dynamic_attributes,
+                        tables=tables,
+                    )
+                )
+
+                if member_values is not None:
+                    member_values.append(value)
+
+            tables.publish(cls)
+
+        return added
+
+    def index_by(cls, attribute: str, unique: bool = False) -> None:
+        """Add secondary index by the given attribute of members, see lookup().
+        If unique is true, raise ValueError if several members have the same attribute value.
+        Indexes are maintained when members are added.
+        """
+        with _get_lock(cls):
+            tables = MemberTables.copy_from(cls)
+            tables.add_index(attribute, unique)
+            tables.publish(cls)
+
+            if cls.enum_frozen:  # new snapshot starts with empty cache, so build it again
+                cls.freeze()
+
+    def lookup_all(cls, **criteria: "Dict[str, Any]") -> "Tuple[E, ...]":
+        """Return members (without aliases) that have given attribute values, using indexes."""
+        tables = cls._tables  # indexes and members of the same snapshot
+        indexes = tables.indexes
+
+        result: Optional[Tuple[E, ...]] = None
+
+        for attribute, key in criteria.items():
+            try:
+                index = indexes[attribute]
+
+            except KeyError:
+                raise ValueError(f"{cls.__name__} is not indexed by {attribute!r}.") from None
+
+            try:
+                members = index.get(key, ())
+
+            except TypeError:  # not hashable, hence not indexed
+                members = ()
+
+            if result is None:
+                result = members
+
+            else:
+                found = set(map(id, members))
+                result = tuple(member for member in result if id(member) in found)
+
+        if result is None:  # no criteria
+            return tables.member_tuple
+
+        return result
+
+    def lookup(cls, **criteria: "Dict[str, Any]") -> "E":
+        """Return the only member that has given attribute values, using indexes."""
+        members = cls.lookup_all(**criteria)
+
+        if len(members) != 1:
+            details = ", ".join(f"{attribute}={key!r}" for attribute, key in criteria.items())
+
+            raise ValueError(
+                f"Expected one {cls.__name__} member with {details}, found {len(members)}."
+            )
+
+        return members[0]
+
+    def freeze(cls) -> None:
+        """Freeze the enum, disallowing adding new members, and build derived caches in advance.
+        Composite flags can still be created, since they do not change the enum itself.
+        from_name() of frozen enums is replaced with one bound to prebuilt name table.
+        """
+        with _get_lock(cls):
+            cls.enum_frozen = True
+            cls._build_caches()
+
+            _install_from_name(cls)
+
+    def get_members(cls, reverse: bool = False) -> "Iterator[E]":
+        """Return iterator over unique members (without aliases), optionally reversing it."""
+        if reverse:
+            return iter(cls._member_tuple_reversed)
+
+        return iter(cls._member_tuple)
+
+    @property
+    def members(cls) -> "Dict[str, E]":
+        """Return mapping proxy for member map (includes aliases).
+        Order is guaranteed from Python 3.7 (CPython 3.6) only.
+        """
+        return cls._member_proxy
+
+    __members__ = members
+
+    @property
+    def lower_names(cls) -> "Dict[str, E]":
+        """Create mapping of lower_name -> member for CI (case insensitive) comparison/lookup."""
+        return dict(_get_cached(cls, "lower_names", _build_lower_names))
+
+    def from_name(cls, name: str) -> None:
+        """CI (case insensitive) member by name lookup."""
+        return _get_cached(cls, "lower_names", _build_lower_names)[_lower_name(name)]
+
+    def from_value(cls, value: "T", default: "U" = null) -> "E":
+        """Lookup member by name and value. On failure, call from_value(default)."""
+        if isinstance(value, str):
+            try:
+                return cls.from_name(value)
+            except KeyError:
+                pass
+
+        try:
+            return cls(value)
+
+        except Exception:  # noqa
+            if default is null:
+                raise
+
+            return cls.from_value(default)
+
+    def as_dict(cls) -> "Dict[str, T]":
+        """Return casefold_name -> member_value mapping overall all members."""
+        return dict(_get_cached(cls, "as_dict", _build_as_dict))
+
+    def parse_stream(
+        cls,
+        tokens: "Iterable[Any]",
+        *,
+        by: str = "value",
+        on_error: str = "raise",
+        default: "Union[E, T]" = null,
+        convert: "Optional[Callable[[Any], T]]" = None,
+    ) -> "ParseStream":
+        """Lazily parse members from tokens, memoizing token -> member mapping.
+
+        by: str -> Either "value", "name" (CI, case insensitive) or "auto" (name, then value).
+        on_error: str -> What to do on invalid tokens: "raise" ValueError, "skip" them,
+        yield "default" member in place of them or "collect" them and skip.
+        default: Union[E, T] -> Member (or anything that from_value() accepts) for "default".
+        convert: Optional[Callable[[Any], T]] -> Function to call on tokens before lookup.
+        """
+        return ParseStream(cls, tokens, by=by, on_error=on_error, default=default, convert=convert)
+
+    def _get_resolver(cls) -> "AsyncResolver":
+        import asyncio
+
+        loop = asyncio.get_event_loop()  # running loop, since we are called by coroutines
+        resolvers = cls.__dict__.get("_resolvers")
+
+        if resolvers is None:
+            from weakref import WeakKeyDictionary
+
+            resolvers = cls._resolvers = WeakKeyDictionary()  # loop -> resolver
+
+        resolver = resolvers.get(loop)
+
+        if resolver is None:
+            resolver = resolvers[loop] = AsyncResolver(cls, loop)
+
+        return resolver
+
+    def _request(cls, value: "T") -> "Any":
+        """Return member with the given value, or future of it, if it needs to be resolved."""
+        try:
+            return cls._value_map[value]
+
+        except KeyError:
+            if getattr(cls, "enum_resolve", None) is None:
+                return cls(value)
+
+        except TypeError:  # not hashable
+            return cls(value)
+
+        return cls._get_resolver().request(value)
+
+    async def aresolve(cls, value: "T") -> "E":
+        """Find member by value, resolving missing values with enum_resolve() hook.
+
+        enum_resolve() is an async classmethod that takes list of missing values and returns
+        value -> name mapping, with names of members that should be added for these values.
+        Missing values requested concurrently are resolved in batches. Without the hook,
+        or if the value is not hashable, this is the same as calling the enum.
+        """
+        member = cls._request(value)
+
+        if isinstance(member, cls):
+            return member
+
+        import asyncio
+
+        # shield the future, since other coroutines could be waiting for it as well
+        return await asyncio.shield(member)
+
+    async def aresolve_many(cls, values: "Iterable[T]") -> "List[E]":
+        """Find members by values, resolving all missing values at once, see aresolve()."""
+        results = [cls._request(value) for value in values]
+
+        futures = [result for result in results if not isinstance(result, cls)]
+
+        if futures:
+            import asyncio
+
+            await asyncio.gather(*map(asyncio.shield, futures))
+
+            results = [
+                result if isinstance(result, cls) else result.result() for result in results
+            ]
+
+        return results
+
+    def aparse(
+        cls,
+        tokens: "AsyncIterable[Any]",
+        *,
+        by: str = "value",
+        on_error: str = "raise",
+        default: "Union[E, T]" = null,
+        convert: "Optional[Callable[[Any], T]]" = None,
+        batch_size: int = BATCH_SIZE,
+    ) -> "AsyncParseStream":
+        """Asynchronously parse members from asynchronous iterable of tokens, in batches.
+        Arguments are same as in parse_stream(), batch_size is amount of tokens
+        read and converted at once. Returns asynchronous iterator.
+        """
+        return AsyncParseStream(
+            cls,
+            tokens,
+            by=by,
+            on_error=on_error,
+            default=default,
+            convert=convert,
+            batch_size=batch_size,
+        )
+
+    def get_typecode(cls) -> str:
+        """Return array typecode used to pack members of the enum.
+
+        Flags are packed as signed 64-bit values, while other enums are packed as ordinals
+        of their members, using 1 byte for up to 256 members, and 2 bytes for up to 65536.
+        Flags with bits above FLAG_PACK_BITS (bit 63 and higher) can not be packed,
+        and ValueError is raised for them.
+        """
+        return _get_typecode(cls._tables)
+
+    def pack(cls, members: "Iterable[Union[E, T]]") -> bytes:
+        """Pack members (or their values) into bytes, see get_typecode() for details.
+        Native byte order is used. Adding members to non-flag enums can change the typecode.
+        """
+        from array import array
+
+        tables = cls._tables  # typecode and ordinals of the same snapshot
+        typecode = _get_typecode(tables)
+
+        if issubclass(cls, Flag):
+            values = [
+                member._value if type(member) is cls else cls(member)._value for member in members
+            ]
+
+            try:
+                return array(typecode, values).tobytes()
+
+            except OverflowError:  # pseudo-members of IntFlag can have bits outside of the mask
+                raise _flag_overflow(cls) from None
+
+        ordinals = tables.get_cached("ordinals", _build_ordinals)
+
+        codes = [
+            ordinals[(member if type(member) is cls else cls(member))._name] for member in members
+        ]
+
+        return array(typecode, codes).tobytes()
+
+    def unpack(cls, buffer: "Any") -> "PackedMembers":
+        """Unpack members from any object supporting buffer protocol, like bytes or mmap.
+        Buffer is not copied, and members are decoded lazily on access.
+        """
+        view = memoryview(buffer)
+
+        if view.format != "B":
+            view = view.cast("B")
+
+        return PackedMembers(cls, view.cast(cls.get_typecode()))
+
+    def share(
+        cls, members: "Union[Iterable[Union[E, T]], array]", *, name: "Optional[str]" = None
+    ) -> "SharedMembers":
+        """Pack members (or their values) into new shared memory segment, see pack().
+        Arrays of codes with matching typecode (like ones from convert_file()) are copied as is.
+
+        Returned object owns the segment; it can be sent to other processes, which attach
+        to the segment by name without copying, or they can call attach() themselves.
+        """
+        from array import array
+
+        SharedMemory = _get_shared_memory_type()
+
+        typecode = cls.get_typecode()
+
+        if isinstance(members, array) and members.typecode == typecode:
+            data = memoryview(members).cast("B")
+
+        else:
+            data = memoryview(cls.pack(members))
+
+        size = len(data)
+
+        memory = SharedMemory(name, create=True, size=max(size, 1))  # size can not be zero
+        memory.buf[:size] = data
+
+        return SharedMembers(cls, memory, size // array(typecode).itemsize, typecode, owner=True)
+
+    def attach(cls, name: str, length: "Optional[int]" = None) -> "SharedMembers":
+        """Attach to shared memory segment created by share() in another process, by name.
+        The segment is not copied, and is not unlinked on release(), only closed.
+        length is the count of members, and defaults to everything the segment can hold
+        (which can include padding, since segments can be rounded up to page size).
+        """
+        return _attach_shared_members(cls, name, length, cls.get_typecode())
+
+    def convert_file(
+        cls,
+        path: "Union[str, os.PathLike]",
+        *,
+        workers: "Optional[int]" = None,
+        chunk_size: int = CHUNK_SIZE,
+        by: str = "value",
+        on_error: str = "raise",
+        default: "Union[E, T]" = null,
+        convert: "Optional[Callable[[str], T]]" = None,
+        encoding: str = "utf-8",
+    ) -> "array":
+        """Convert file with one token per line into array of codes, see get_typecode().
+
+        The file is split into byte ranges of chunk_size, which are converted in parallel
+        by a pool of worker processes (os.cpu_count() if None). Only lookup tables are sent
+        to workers, and only packed codes are sent back. Tokens that are not found in tables
+        (like composite flags or names in other case) are resolved in this process.
+
+        by, on_error, default and convert are same as in parse_stream(), except that on_error
+        can only be "raise" or "default", so that codes match lines of the file.
+        convert has to be picklable, and is called on stripped lines.
+        """
+        from array import array
+
+        if on_error not in ("raise", "default"):
+            raise ValueError(f"Expected on_error to be 'raise' or 'default', got {on_error!r}.")
+
+        if chunk_size < 1:
+            raise ValueError(f"Expected chunk_size to be positive, got {chunk_size!r}.")
+
+        stream = ParseStream(cls, (), by=by, on_error=on_error, default=default, convert=convert)
+
+        tables = cls._tables  # codes and typecode of the same snapshot
+        typecode = _get_typecode(tables)
+
+        codes_by_token = tables.get_cached("value_codes", _build_value_codes)
+
+        if by == "name":
+            codes_by_token = tables.get_cached("name_codes", _build_name_codes)
+
+        elif by == "auto":  # names take precedence over values
+            name_codes = tables.get_cached("name_codes", _build_name_codes)
+            codes_by_token = {**codes_by_token, **name_codes}
+
+        path = os.fspath(path)
+        size = os.path.getsize(path)
 
-                if new_func is not None:  # assigned in inner loop, break from outer loop
-                    break
+        ranges = [(start, start + chunk_size) for start in range(0, size, chunk_size)]
+        arguments = (codes_by_token, convert, encoding, typecode)
 
-            else:
-                new_func = OBJECT_NEW
+        if workers == 1 or len(ranges) < 2:
+            results = [_convert_range(path, start, end, *arguments) for start, end in ranges]
 
         else:
-            new_member_save = True
+            from concurrent.futures import ProcessPoolExecutor
 
-        new_use_args = new_func is not OBJECT_NEW
+            with ProcessPoolExecutor(workers) as executor:
+                futures = [
+                    executor.submit(_convert_range, path, start, end, *arguments)
+                    for start, end in ranges
+                ]
 
-        return new_func, new_member_save, new_use_args
+                results = [future.result() for future in futures]
 
-    def add_member(cls, name: str, value: T) -> E:
-        """Add new member to the enum. auto() is allowed."""
-        if isinstance(value, auto):
-            if value.value is null:  # if null => generate next value
-                value.value = cls.enum_generate_next_value(
-                    name, None, len(cls._member_names), cls._member_values.copy()
-                )
-            value = value.value
-
-        return _create_enum_member(
-            member_name=name,
-            member_type=cls._member_type,
-            member_value=value,
-            enum_class=cls,
-            new_function=cls._new_function,
-            use_args=cls._use_args,
-            dynamic_attributes=cls._dynamic_attributes,
-        )
+        codes = array(typecode)
+        resolved: List[Tuple[int, E]] = []
 
-    def update(cls, **name_to_value: Dict[str, T]) -> None:
-        """Add new member to enum for each name and value in args."""
-        for name, value in name_to_value.items():
-            cls.add_member(name, value)
+        for packed, missing in results:
+            offset = len(codes)
 
-    def get_members(cls, reverse: bool = False) -> Iterator[E]:
-        """Return iterator over unique members (without aliases), optionally reversing it."""
-        names = cls._member_names
+            codes.frombytes(packed)
 
-        if reverse:
-            names = reversed(names)
+            for index, token in missing:
+                member = stream.resolve(token)
 
-        return (cls._member_map[name] for name in names)
+                if member is null:
+                    if on_error == "raise":
+                        raise ValueError(
+                            f"{token!r} (at line {offset + index + 1} of {path!r}) "
+                            f"is not a valid {cls.__name__}."
+                        )
 
-    @property
-    def members(cls) -> Dict[str, E]:
-        """Return mapping proxy for member map (includes aliases).
-        Order is guaranteed from Python 3.7 (CPython 3.6) only.
-        """
-        return MappingProxyType(cls._member_map)
+                    member = stream.default
 
-    __members__ = members
+                resolved.append((offset + index, member))
 
-    @property
-    def lower_names(cls) -> Dict[str, E]:
-        """Create mapping of lower_name -> member for CI (case insensitive) comparison/lookup."""
-        return {_lower_name(name): member for name, member in cls.members.items()}
+        if resolved:  # resolving could add members, which can change the typecode
+            tables = cls._tables
 
-    def from_name(cls, name: str) -> None:
-        """CI (case insensitive) member by name lookup."""
-        return cls.lower_names[_lower_name(name)]
+            if _get_typecode(tables) != typecode:
+                codes = array(_get_typecode(tables), codes)
 
-    def from_value(cls, value: T, default: U = null) -> E:
-        """Lookup member by name and value. On failure, call from_value(default)."""
-        if isinstance(value, str):
-            try:
-                return cls.from_name(value)
-            except KeyError:
-                pass
+            if issubclass(cls, Flag):
+                try:
+                    for index, member in resolved:
+                        codes[index] = member._value
 
-        try:
-            return cls(value)
+                except OverflowError:
+                    raise _flag_overflow(cls) from None
 
-        except Exception:  # noqa
-            if default is null:
-                raise
+            else:
+                ordinals = tables.get_cached("ordinals", _build_ordinals)
 
-            return cls.from_value(default)
+                for index, member in resolved:
+                    codes[index] = ordinals[member._name]
 
-    def as_dict(cls) -> Dict[str, T]:
-        """Return casefold_name -> member_value mapping overall all members."""
-        return {name.casefold(): member.value for name, member in cls.members.items()}
+        return codes
 
 
 class Enum(metaclass=EnumMeta):
@@ -898,7 +2702,7 @@ class Enum(metaclass=EnumMeta):
     Derive from this class to define new enumerations.
     """
 
-    def __new__(cls, value: T) -> E:
+    def __new__(cls, value: "T") -> "E":
         """Implement member by value lookup."""
         # all enum instances are created during class construction without calling this method;
         # this method is called by the metaclass' __call__ and pickle
@@ -915,10 +2719,20 @@ class Enum(metaclass=EnumMeta):
 
         except TypeError:
             # not there, then do long search, O(n) behavior
+            stats = cls._stats
+
+            if stats is not None:
+                stats.linear_scans += 1
+
             for member in cls._member_map.values():
                 if member._value == value:
                     return member
 
+        stats = cls._stats
+
+        if stats is not None:
+            stats.missing_calls += 1
+
         # still not found => try enum_missing hook
         try:
             exception = None
@@ -950,6 +2764,12 @@ class Enum(metaclass=EnumMeta):
 
     enum_generate_next_value = staticmethod(incremental_next_value)
 
+    @classmethod
+    def _build_caches(cls) -> None:
+        """Build derived caches in advance. Used by frozen enums."""
+        _get_cached(cls, "lower_names", _build_lower_names)
+        _get_cached(cls, "as_dict", _build_as_dict)
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}.{self._name}: {self._value}>"
 
@@ -970,10 +2790,19 @@ class Enum(metaclass=EnumMeta):
     def __hash__(self) -> int:
         return hash(self._name)
 
-    def __reduce_ex__(self, protocol: int) -> Tuple[Type[E], T]:
+    def __reduce_ex__(self, protocol: int) -> "Tuple[Callable[..., E], Tuple[Any, ...]]":
+        if self.enum_compact_pickle and self._name is not None:
+            return _load_member, (self.__class__, self._name)
+
         return self.__class__, (self._value,)
 
-    def __dir__(self) -> List[str]:
+    def __copy__(self: "E") -> "E":
+        return self  # members are singletons
+
+    def __deepcopy__(self: "E", memo: "Dict[int, Any]") -> "E":
+        return self  # same here
+
+    def __dir__(self) -> "List[str]":
         added_behavior = [
             key for key in OBJECT_DIR(self) if not _is_special(key) and key not in self._member_map
         ]
@@ -985,24 +2814,172 @@ class Enum(metaclass=EnumMeta):
         return _make_readable(self._name)
 
     @dynamic_attribute
-    def name(self) -> Optional[str]:
+    def name(self) -> "Optional[str]":
         """Name of the Enum member."""
         return self._name
 
     @dynamic_attribute
-    def value(self) -> T:
+    def value(self) -> "T":
         """Value of the Enum member."""
         return self._value
 
 
-USELESS_NEW.add(Enum.__new__)
+ENUM_NEW = Enum.__new__  # saved, since instrumented enums replace __new__
+ENUM_FROM_NAME = EnumMeta.from_name  # same for from_name(), which frozen enums replace as well
+
+USELESS_NEW.add(ENUM_NEW)
+
+
+class LookupStats:
+    """Lookup counters of instrumented enums, see instrument().
+    Counters are not synchronized, therefore they are approximate when updated from many threads.
+
+    value_hits: int -> Count of by-value lookups found in value -> member map.
+    value_misses: int -> Count of by-value lookups not found in value -> member map.
+    linear_scans: int -> Count of O(n) searches for unhashable values.
+    missing_calls: int -> Count of enum_missing() calls.
+    composites_created: int -> Count of composite flags created.
+    name_lookups: int -> Count of from_name() calls.
+    creation_time: Optional[float] -> Time taken to create the class, in seconds.
+    This is recorded only if instrument() was called without arguments beforehand.
+    """
+
+    COUNTERS = (
+        "value_hits",
+        "value_misses",
+        "linear_scans",
+        "missing_calls",
+        "composites_created",
+        "name_lookups",
+    )
+
+    __slots__ = COUNTERS + ("creation_time",)
+
+    def __init__(self) -> None:
+        self.creation_time: Optional[float] = None
+        self.reset()
+
+    def __repr__(self) -> str:
+        return "<{} {}>".format(
+            self.__class__.__name__,
+            " ".join(f"{name}={value!r}" for name, value in self.as_dict().items()),
+        )
+
+    def reset(self) -> None:
+        """Reset all counters to zero. Creation time is preserved."""
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+
+    def as_dict(self) -> "Dict[str, Union[int, Optional[float]]]":
+        """Return name -> value mapping of all counters, along with creation time."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _instrumented_new(cls, value: "T") -> "E":
+    """Enum.__new__ that counts by-value lookups. Installed by instrument()."""
+    if type(value) is cls:
+        return value
+
+    try:
+        member = cls._value_map[value]
+
+    except (KeyError, TypeError):
+        cls._stats.value_misses += 1
+        return ENUM_NEW(cls, value)
+
+    cls._stats.value_hits += 1
+    return member
+
+
+def _instrumented_from_name(cls, name: str) -> "E":
+    """EnumMeta.from_name that counts name lookups. Installed by instrument()."""
+    cls._stats.name_lookups += 1
+    return ENUM_FROM_NAME(cls, name)
+
+
+def instrument(enum_class: "Optional[Type[E]]" = None) -> "Optional[LookupStats]":
+    """Enable lookup counters for the given enum class, returning its stats.
+    If called without arguments, all enums created afterwards will be instrumented,
+    recording time taken to create them.
+
+    Enums that are not instrumented do not pay anything for counting,
+    as instrumented ones get their own __new__ and from_name() that do the counting.
+    """
+    global INSTRUMENT_ENUMS
+
+    if enum_class is None:
+        INSTRUMENT_ENUMS = True
+        return None
+
+    with _get_lock(enum_class):
+        if enum_class._stats is None:
+            enum_class._stats = LookupStats()
+            enum_class.__new__ = _instrumented_new
+
+            _install_from_name(enum_class)
+
+    return enum_class._stats
+
+
+USELESS_NEW.add(_instrumented_new)
+
+
+def uninstrument(enum_class: "Optional[Type[E]]" = None) -> None:
+    """Disable lookup counters for the given enum class, dropping its stats.
+    If called without arguments, enums created afterwards will not be instrumented.
+    """
+    global INSTRUMENT_ENUMS
+
+    if enum_class is None:
+        INSTRUMENT_ENUMS = False
+        return
+
+    with _get_lock(enum_class):
+        if enum_class._stats is not None:
+            enum_class.__new__ = ENUM_NEW
+            enum_class._stats = None
+
+            _install_from_name(enum_class)
 
 
 class IntEnum(int, Enum):
     """Generic enumeration for integer-based values."""
 
 
-def unique(enumeration: Type[Enum]) -> Type[Enum]:
+class StrEnum(str, Enum):
+    """Generic enumeration for string-based values.
+
+    Values are interned, and members can also be found by case-folded values, see from_value_ci().
+    auto() generates lowercased names of members.
+    """
+
+    enum_generate_next_value = staticmethod(lower_name_next_value)
+
+    @classmethod
+    def _build_caches(cls) -> None:
+        super()._build_caches()
+        _get_cached(cls, "folded_values", _build_folded_values)
+
+    @classmethod
+    def from_value_ci(cls, value: str) -> "E":
+        """CI (case insensitive) member by value lookup."""
+        try:  # exact values do not need to be case-folded
+            return cls._value_map[value]
+
+        except KeyError:
+            pass
+
+        except TypeError:  # not hashable, hence not a string
+            raise ValueError(f"{value!r} is not a valid {cls.__name__}.") from None
+
+        try:
+            return _get_cached(cls, "folded_values", _build_folded_values)[value.casefold()]
+
+        except (AttributeError, KeyError):  # not a string or not found
+            raise ValueError(f"{value!r} is not a valid {cls.__name__}.") from None
+
+
+def unique(enumeration: "Type[Enum]") -> "Type[Enum]":
     """Class decorator for enumerations ensuring unique member values."""
     duplicates = []
 
@@ -1024,7 +3001,17 @@ class Flag(Enum):
     enum_generate_next_value = staticmethod(strict_bit_next_value)
 
     @classmethod
-    def enum_missing(cls, value: T) -> Enum:
+    def _build_caches(cls) -> None:
+        super()._build_caches()
+
+        for value in cls._value_map:  # decompose all members, including composite ones
+            _decompose(cls, value)
+
+        _get_cached(cls, "bit_members", _build_bit_members)
+        _get_cached(cls, "mask", _build_mask)
+
+    @classmethod
+    def enum_missing(cls, value: "T") -> "Enum":
         """Create composite members on missing enums."""
         original_value = value
 
@@ -1039,29 +3026,42 @@ class Flag(Enum):
         return possible_member
 
     @classmethod
-    def _create_composite_member(cls, value: T) -> Enum:
+    def _create_composite_member(cls, value: "T") -> "Enum":
         """Generate member composed of other members."""
         composite_member = cls._value_map.get(value)
 
         if composite_member is None:
-            _, extra_flags = _decompose(cls, value)
+            with _get_lock(cls):
+                # check again, since other thread could have created it while we were waiting
+                composite_member = cls._value_map.get(value)
+
+                if composite_member is None:
+                    _, extra_flags = _decompose(cls, value)
+
+                    if extra_flags:
+                        raise ValueError(f"{value!r} is not a valid {cls.__name__}.")
+
+                    tables = MemberTables.copy_from(cls, copy_names=False)
+
+                    composite_member = _create_enum_member(
+                        member_name=None,
+                        member_type=cls._member_type,
+                        member_value=value,
+                        enum_class=cls,
+                        new_function=cls._new_function,
+                        use_args=cls._use_args,
+                        dynamic_attributes=cls._dynamic_attributes,
+                        tables=tables,
+                    )
 
-            if extra_flags:
-                raise ValueError(f"{value!r} is not a valid {cls.__name__}.")
+                    tables.publish(cls)
 
-            composite_member = _create_enum_member(
-                member_name=None,
-                member_type=cls._member_type,
-                member_value=value,
-                enum_class=cls,
-                new_function=cls._new_function,
-                use_args=cls._use_args,
-                dynamic_attributes=cls._dynamic_attributes,
-            )
+                    if cls._stats is not None:
+                        cls._stats.composites_created += 1
 
         return composite_member
 
-    def __contains__(self, other: Enum) -> bool:
+    def __contains__(self, other: "Enum") -> bool:
         if not isinstance(other, self.__class__):
             raise TypeError(
                 "Unsupported operand type(s) for 'in': '{other_name}' and '{self_name}'".format(
@@ -1069,7 +3069,9 @@ class Flag(Enum):
                 )
             )
 
-        return other._value & self._value == other._value
+        value = other._value
+
+        return value & self._value == value
 
     def __repr__(self) -> str:
         if self._name is None:
@@ -1084,15 +3086,75 @@ class Flag(Enum):
         return f"{self.__class__.__name__}.{self._name}"
 
     @classmethod
-    def from_args(cls, *args) -> Enum:
-        result = cls(0)
+    def from_composite_name(cls, text: str) -> "Enum":
+        """CI (case insensitive) flag by composite name lookup, inverse of composite_name.
+        Names can be separated by either "|" or ",", for instance, "READ|WRITE" or "read, write".
+        """
+        memo = _get_cached(cls, "composite_names", _build_memo)
+
+        try:
+            return memo[text]
+
+        except (KeyError, TypeError):  # not memoized or not hashable (hence not a string)
+            pass
+
+        lower_names = _get_cached(cls, "lower_names", _build_lower_names)
+        value = 0
+
+        try:
+            names = text.replace(",", "|").split("|")
+
+        except AttributeError:  # not a string
+            raise ValueError(f"{text!r} is not a valid {cls.__name__} composite name.") from None
+
+        for name in names:
+            name = name.strip()
+
+            if not name:
+                continue
+
+            try:
+                value |= lower_names[_lower_name(name)]._value
+
+            except KeyError:
+                raise ValueError(f"{name!r} is not a valid {cls.__name__} name.") from None
+
+        member = cls(value)  # one composite lookup for all names
+
+        if len(memo) < MEMO_SIZE:
+            memo[text] = member
+
+        return member
+
+    @classmethod
+    def from_args(cls, *args) -> "Enum":
+        value = 0
 
         for arg in args:
-            result |= cls.from_value(arg)
+            value |= (arg if type(arg) is cls else cls.from_value(arg))._value
 
-        return result
+        return cls(value)  # one composite lookup for all arguments
+
+    def iter_bits(self) -> "Iterator[Enum]":
+        """Iterate over single-bit members that are set in the flag, from lowest to highest bit."""
+        bit_members, bits = _get_cached(self.__class__, "bit_members", _build_bit_members)
+
+        value = self._value & bits  # bits that do not have members are skipped
+
+        while value:
+            bit = value & -value  # lowest set bit
+            yield bit_members[bit]
+            value ^= bit
+
+    __iter__ = iter_bits
+
+    def __len__(self) -> int:
+        """Return count of single-bit members that are set in the flag."""
+        _, bits = _get_cached(self.__class__, "bit_members", _build_bit_members)
 
-    def decompose(self, reverse: bool = False) -> List[Enum]:
+        return bin(self._value & bits).count("1")
+
+    def decompose(self, reverse: bool = False) -> "List[Enum]":
         """Decompose composite flag into all flags it can contain."""
         members, _ = _decompose(self.__class__, self._value)
 
@@ -1116,49 +3178,69 @@ class Flag(Enum):
     def __bool__(self) -> bool:
         return bool(self._value)
 
-    def __or__(self, other: Union[T, Enum]) -> Enum:
+    def __or__(self, other: "Union[T, Enum]") -> "Enum":
         cls = self.__class__
 
-        try:
-            other = cls(other)
+        other_value = other._value if type(other) is cls else _flag_operand(cls, other)
 
-        except Exception:  # noqa  # pragma: no cover
+        if other_value is None:
             return NotImplemented
 
-        return cls(self._value | other._value)
+        value = self._value | other_value
+        member = cls._value_map.get(value)
+
+        return cls(value) if member is None else member
 
-    def __and__(self, other: Union[T, Enum]) -> Enum:
+    def __and__(self, other: "Union[T, Enum]") -> "Enum":
         cls = self.__class__
 
-        try:
-            other = cls(other)
+        other_value = other._value if type(other) is cls else _flag_operand(cls, other)
 
-        except Exception:  # noqa  # pragma: no cover
+        if other_value is None:
             return NotImplemented
 
-        return cls(self._value & other._value)
+        value = self._value & other_value
+        member = cls._value_map.get(value)
 
-    def __xor__(self, other: Union[T, Enum]) -> Enum:
+        return cls(value) if member is None else member
+
+    def __xor__(self, other: "Union[T, Enum]") -> "Enum":
         cls = self.__class__
 
-        try:
-            other = cls(other)
+        other_value = other._value if type(other) is cls else _flag_operand(cls, other)
 
-        except Exception:  # noqa  # pragma: no cover
+        if other_value is None:
             return NotImplemented
 
-        return cls(self._value ^ other._value)
+        value = self._value ^ other_value
+        member = cls._value_map.get(value)
+
+        return cls(value) if member is None else member
 
-    def __invert__(self) -> Enum:
+    def __invert__(self) -> "Enum":
         cls = self.__class__
-        members = self.decompose()
-        inverted = cls(0)
+        value = self._value
+        tables = cls._tables  # mask and members of the same snapshot
+        inverted = tables.get_cached("mask", _build_mask) & ~value
+
+        member = cls._value_map.get(inverted)  # fast path, composite already exists
+
+        if member is not None:
+            return member
 
-        for member in cls.get_members():
-            if member not in members and not (member._value & self._value):
-                inverted = inverted | member
+        try:
+            return cls(inverted)
+
+        except ValueError:
+            # some bits are only set in members that overlap with this flag,
+            # so we need to combine members that do not overlap with it
+            inverted = 0
 
-        return cls(inverted)
+            for member in tables.member_tuple:
+                if not member._value & value:
+                    inverted |= member._value
+
+            return cls(inverted)
 
     __ior__ = __or__
     __iand__ = __and__
@@ -1173,17 +3255,26 @@ class IntFlag(int, Flag):
     """Support for integer-based bit flags."""
 
     @classmethod
-    def enum_missing(cls, value: int) -> Flag:
+    def enum_missing(cls, value: int) -> "Flag":
         if not isinstance(value, int):
             raise ValueError(f"{value!r} is not a valid {cls.__name__}.")
 
         return cls._create_composite_member(value)
 
     @classmethod
-    def _create_composite_member(cls, value: int) -> Flag:
+    def _create_composite_member(cls, value: int) -> "Flag":
         composite_member = cls._value_map.get(value)
 
-        if composite_member is None:
+        if composite_member is not None:
+            return composite_member
+
+        with _get_lock(cls):
+            # check again, since other thread could have created it while we were waiting
+            composite_member = cls._value_map.get(value)
+
+            if composite_member is not None:
+                return composite_member
+
             need_to_create = [value]
 
             _, extra_flags = _decompose(cls, value)  # get unaccounted for bits
@@ -1201,6 +3292,8 @@ class IntFlag(int, Flag):
                 else:
                     extra_flags ^= flag_value
 
+            tables = MemberTables.copy_from(cls, copy_names=False)
+
             for value in reversed(need_to_create):
                 composite_member = _create_enum_member(
                     member_name=None,
@@ -1210,31 +3303,65 @@ class IntFlag(int, Flag):
                     new_function=cls._new_function,
                     use_args=cls._use_args,
                     dynamic_attributes=cls._dynamic_attributes,
+                    tables=tables,
                 )
 
+            tables.publish(cls)
+
+            if cls._stats is not None:
+                cls._stats.composites_created += len(need_to_create)
+
         return composite_member
 
-    def __invert__(self) -> Flag:
+    def __invert__(self) -> "Flag":
         return self.__class__(~self._value)
 
 
-def _decompose(flag: Type[Flag], value: int) -> Tuple[List[Flag], int]:
+def _flag_operand(flag: "Type[Flag]", other: "Any") -> "Optional[int]":
+    """Return value of the given operand of flag operation, or None if it is not valid."""
+    if type(other) is int and other in flag._value_map:  # no need to coerce valid values
+        return other
+
+    try:
+        return flag(other)._value
+
+    except Exception:  # noqa
+        return None
+
+
+def _build_sorted_flags(tables: "MemberSnapshot") -> "Tuple[Flag, ...]":
+    members = [member for member in tables.member_tuple if member._value]
+    members.sort(key=lambda member: member._value, reverse=True)
+    return tuple(members)
+
+
+def _decompose(flag: "Type[Flag]", value: int) -> "Tuple[List[Flag], int]":
     """Decompose given flag into flag members that value is composed of.
     Returns (flags, not_covered) tuple, where not_covered represents
     value that was not covered by any flag members.
     """
+    decompositions = _get_cached(flag, "decompositions", _build_dict)
+
+    try:
+        members, not_covered = decompositions[value]
+        return list(members), not_covered
+
+    except KeyError:
+        pass
+
     not_covered = value
     is_not_negative = value >= 0
 
     members = []
 
-    for member in flag:
+    # flags are sorted by their values, descending
+    for member in _get_cached(flag, "sorted_flags", _build_sorted_flags):
         member_value = member._value
-        if member_value and member_value & value == member_value:
+        if member_value & value == member_value:
             members.append(member)
             not_covered &= ~member_value
 
-    if is_not_negative:
+    if is_not_negative and not_covered:
         temporary = not_covered
 
         while temporary:
@@ -1246,15 +3373,19 @@ def _decompose(flag: Type[Flag], value: int) -> Tuple[List[Flag], int]:
 
             temporary &= ~flag_value
 
+        members.sort(key=lambda member: member._value, reverse=True)
+
     if not members and value in flag._value_map:
         members.append(flag._value_map[value])
 
-    members.sort(key=lambda member: member._value, reverse=True)
-
     if len(members) > 1 and members[0].value == value:  # pragma: no cover
         # do not need the value member itself
         members.pop(0)
 
+    if members and not not_covered:
+        # only cache decompositions that can not be changed by creating composite flags
+        decompositions[value] = tuple(members), not_covered
+
     return members, not_covered
 
 
@@ -1280,7 +3411,7 @@ class Order(Trait):
     def __hash__(self) -> int:  # need to redefine because we implement == and !=
         return hash(self._name)
 
-    def __eq__(self, other: Any) -> bool:
+    def __eq__(self, other: "Any") -> bool:
         try:
             other = self.__class__(other)
 
@@ -1289,7 +3420,7 @@ class Order(Trait):
 
         return self._value == other._value
 
-    def __ne__(self, other: Any) -> bool:
+    def __ne__(self, other: "Any") -> bool:
         try:
             other = self.__class__(other)
 
@@ -1298,7 +3429,7 @@ class Order(Trait):
 
         return self._value != other._value
 
-    def __lt__(self, other: Any) -> bool:
+    def __lt__(self, other: "Any") -> bool:
         try:
             other = self.__class__(other)
 
@@ -1307,7 +3438,7 @@ class Order(Trait):
 
         return self._value < other._value
 
-    def __gt__(self, other: Any) -> bool:
+    def __gt__(self, other: "Any") -> bool:
         try:
             other = self.__class__(other)
 
@@ -1316,7 +3447,7 @@ class Order(Trait):
 
         return self._value > other._value
 
-    def __le__(self, other: Any) -> bool:
+    def __le__(self, other: "Any") -> bool:
         try:
             other = self.__class__(other)
 
@@ -1325,7 +3456,7 @@ class Order(Trait):
 
         return self._value <= other._value
 
-    def __ge__(self, other: Any) -> bool:
+    def __ge__(self, other: "Any") -> bool:
         try:
             other = self.__class__(other)
 
@@ -1335,6 +3466,221 @@ class Order(Trait):
         return self._value >= other._value
 
 
+class JSONCodec:
+    """JSON encoding and decoding of enum members.
+
+    by: str -> Either "value" (default) or "name", defines how members are encoded.
+    Named flags are encoded as names, while composite flags are encoded as lists
+    containing names of flags they are composed of, and values of unnamed bits.
+    """
+
+    BY = ("value", "name")
+
+    def __init__(self, by: str = "value") -> None:
+        if by not in self.BY:
+            raise ValueError(f"Expected by to be one of {self.BY}, got {by!r}.")
+
+        self.by = by
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(by={self.by!r})"
+
+    def encode(self, member: "Enum") -> "Any":
+        """Encode member into JSON-compatible object."""
+        if self.by == "value":
+            return member._value
+
+        if member._name is None:  # composite flag
+            return [(flag._name or flag._value) for flag in member.decompose()]
+
+        return member._name
+
+    def default(self, some_object: "Any") -> "Any":
+        """Hook to pass as default to json.dump() and json.dumps().
+        Note that members of enums with JSON-compatible data types (e.g. IntEnum)
+        are encoded by json itself, without calling this hook.
+        """
+        if isinstance(some_object, Enum):
+            return self.encode(some_object)
+
+        raise TypeError(f"Object of type {type(some_object).__name__} is not JSON serializable.")
+
+    def decode(self, enum_class: "Type[E]", data: "Any") -> "E":
+        """Decode member of the given enum class from JSON-compatible object."""
+        if self.by == "value":
+            try:
+                return enum_class._value_map[data]
+
+            except KeyError:
+                pass
+
+            except TypeError:  # not hashable, so we might have received list in place of tuple
+                if isinstance(data, list):
+                    try:
+                        return enum_class._value_map[tuple(data)]
+
+                    except (KeyError, TypeError):
+                        pass
+
+            return enum_class(data)  # go through composite flags and enum_missing
+
+        if isinstance(data, list):  # composite flag
+            value = 0
+
+            for part in data:
+                if not isinstance(part, int):
+                    part = self._decode_name(enum_class, part)._value
+
+                value |= part
+
+            return enum_class(value)
+
+        return self._decode_name(enum_class, data)
+
+    @staticmethod
+    def _decode_name(enum_class: "Type[E]", name: str) -> "E":
+        try:
+            return enum_class._member_map[name]
+
+        except KeyError:
+            pass
+
+        except TypeError:
+            raise ValueError(f"{name!r} is not a valid {enum_class.__name__} name.") from None
+
+        try:
+            return _get_cached(enum_class, "lower_names", _build_lower_names)[_lower_name(name)]
+
+        except (AttributeError, KeyError):  # not a string or not found
+            raise ValueError(f"{name!r} is not a valid {enum_class.__name__} name.") from None
+
+    def dumps(self, members: "Iterable[Enum]", **kwargs) -> str:
+        """Encode members into JSON array. Keyword arguments are passed to json.dumps()."""
+        import json
+
+        encode = self.encode
+        return json.dumps([encode(member) for member in members], **kwargs)
+
+    def loads(self, enum_class: "Type[E]", string: "Union[str, bytes]", **kwargs) -> "List[E]":
+        """Decode members of the given enum class from JSON array.
+        Keyword arguments are passed to json.loads().
+        """
+        import json
+
+        decode = self.decode
+        return [decode(enum_class, item) for item in json.loads(string, **kwargs)]
+
+
+def _sizeof(some_object: "Any", seen: "Set[int]") -> int:
+    """Estimate size of the object along with objects in it, if it is a container.
+    Objects with IDs in seen are skipped, and IDs of processed objects are added there.
+    """
+    object_id = id(some_object)
+
+    if object_id in seen:
+        return 0
+
+    seen.add(object_id)
+
+    size = sys.getsizeof(some_object)
+
+    if isinstance(some_object, dict):
+        for key, value in some_object.items():
+            size += _sizeof(key, seen) + _sizeof(value, seen)
+
+    elif isinstance(some_object, (tuple, list, set, frozenset)):
+        for item in some_object:
+            size += _sizeof(item, seen)
+
+    return size
+
+
+def _sizeof_member(member: "Enum", seen: "Set[int]") -> int:
+    size = _sizeof(member, seen)
+
+    member_dict = getattr(member, "__dict__", None)
+
+    if member_dict is not None:
+        size += _sizeof(member_dict, seen)  # includes name and value
+
+    return size
+
+
+def memory_report(enum_class: "Type[E]") -> "Dict[str, int]":
+    """Estimate memory (in bytes) retained by the enum class, by category.
+
+    members: Canonical members, along with their names and values.
+    composites: Composite flags.
+    aliases: Names of aliases.
+    values: Member values list (also contains values of composite flags).
+    member_map: Name -> member map.
+    value_map: Value -> member map.
+    member_tuples: Member names list, cached member tuples and member map proxy.
+    indexes: Secondary indexes.
+    caches: Derived caches (CI names, decompositions and others).
+    total: Sum of everything above.
+
+    Each object is accounted for once, in the first category it is found in.
+    """
+    seen: Set[int] = set()
+
+    tables = enum_class._tables
+    member_map = tables.member_map
+
+    report = dict(
+        members=sum(_sizeof_member(member, seen) for member in tables.member_tuple),
+        composites=sum(
+            _sizeof_member(member, seen)
+            for member in tables.value_map.values()
+            if member._name is None
+        ),
+        aliases=sum(
+            _sizeof(name, seen) for name, member in member_map.items() if name != member._name
+        ),
+        values=_sizeof(tables.member_values, seen),
+        member_map=_sizeof(member_map, seen),
+        value_map=_sizeof(tables.value_map, seen),
+        member_tuples=sum(
+            _sizeof(some_object, seen)
+            for some_object in (
+                tables.member_names,
+                tables.member_tuple,
+                tables.member_tuple_reversed,
+                tables.member_proxy,
+            )
+        ),
+        indexes=_sizeof(tables.indexes, seen),
+        caches=_sizeof(tables.cache, seen),
+    )
+
+    report.update(total=sum(report.values()))
+
+    return report
+
+
+def _get_enum_classes() -> "List[Type[E]]":
+    # all existing enum classes, found by walking subclasses (which are kept weakly) of Enum
+    enum_classes = [Enum]
+    seen = {Enum}
+
+    for enum_class in enum_classes:  # extended while iterating
+        for subclass in type.__subclasses__(enum_class):
+            if subclass not in seen:
+                seen.add(subclass)
+                enum_classes.append(subclass)
+
+    return enum_classes
+
+
+def memory_reports() -> "List[Tuple[Type[E], Dict[str, int]]]":
+    """Return (enum_class, memory_report(enum_class)) pairs for all existing enum classes,
+    sorted by total memory, from largest to smallest.
+    """
+    reports = [(enum_class, memory_report(enum_class)) for enum_class in _get_enum_classes()]
+    reports.sort(key=lambda pair: pair[1]["total"], reverse=True)
+    return reports
+
+
 if __name__ == "__main__":  # pragma: no cover
     import doctest
 
@@ -1,8 +1,33 @@
+from array import array
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import gc
+import io
+import itertools
+import json
+from pathlib import Path
 import pickle
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import pytest
 
-from enums import Enum, IntEnum, Flag, IntFlag, Order, StrFormat, auto, unique
+from enums import (
+    Enum,
+    IntEnum,
+    Flag,
+    IntFlag,
+    JSONCodec,
+    Order,
+    StrEnum,
+    StrFormat,
+    auto,
+    unique,
+)
 import enums
 
 # below are some enums used for testing
@@ -86,6 +111,15 @@ class AutoMissing(Enum, auto_on_missing=True, start=1):
     FIRST, SECOND, THIRD  # 1, 2, 3  # noqa: F821
 
 
+class Point(Enum):
+    ORIGIN = (0, 0)
+    UNIT = (1, 1)
+
+    def __init__(self, x: int, y: int) -> None:
+        self.x = x
+        self.y = y
+
+
 class PickleClass:
     pass  # to be used for pickle test
 
@@ -94,6 +128,11 @@ def format_is_value(format_string: str, member: Enum) -> bool:
     return format_string.format(member) == format_string.format(member.value)
 
 
+def count_shared(members: Any, member: Enum) -> int:
+    with members:  # runs in worker processes, which attach to shared memory
+        return members.count(member)
+
+
 class TestHelpers:
     DESCRIPTOR_ATTRIBUTES = ("__get__", "__set__", "__delete__")  # attributes of descriptors
     VALUE = 13  # any value to use as placeholder
@@ -382,6 +421,23 @@ class TestEnum:
     def test_iter_and_reverse(self) -> None:
         assert list(reversed(list(Season))) == list(reversed(Season))
 
+    def test_cached_members(self) -> None:
+        class Color(Enum):
+            RED = 1
+            GREEN = 2
+            R = 1  # alias
+
+        assert tuple(Color) == (Color.RED, Color.GREEN)
+        assert tuple(reversed(Color)) == (Color.GREEN, Color.RED)
+        assert Color.members is Color.members
+
+        Color.add_member("BLUE", 3)
+
+        assert tuple(Color) == (Color.RED, Color.GREEN, Color.BLUE)
+        assert tuple(Color.get_members(reverse=True)) == (Color.BLUE, Color.GREEN, Color.RED)
+        assert len(Color) == 3
+        assert "BLUE" in Color.members
+
     def test_class_bool(self) -> None:
         assert bool(Season)  # explicit bool() call here
 
@@ -477,6 +533,127 @@ class TestEnum:
     def test_hash(self) -> None:
         assert hash(Constant.E) == hash(Constant.E.name)
 
+    def test_copy(self) -> None:
+        members = [Season.WINTER, Grade.A, Perm.R | Perm.W, IntPerm.R | 8, Point.ORIGIN]
+
+        for member in members:
+            assert copy.copy(member) is member
+            assert copy.deepcopy(member) is member
+
+        copied = copy.deepcopy({"members": members})["members"]
+
+        assert all(copied_member is member for copied_member, member in zip(copied, members))
+
+    def test_compact_pickle(self) -> None:
+        class Planet(Enum, compact_pickle=True):
+            EARTH = (5.976e24, 6.37814e6)
+            MARS = (6.421e23, 3.3972e6)
+
+            def __init__(self, mass: float, radius: float) -> None:
+                self.mass = mass
+                self.radius = radius
+
+        Planet.__qualname__ = "CompactPlanet"  # make the class importable
+        globals()["CompactPlanet"] = Planet
+
+        try:
+            for member in Planet:
+                assert pickle.loads(pickle.dumps(member)) is member
+
+            data = pickle.dumps(Planet.EARTH)
+
+            assert b"EARTH" in data and b"5.976" not in data
+
+        finally:
+            del globals()["CompactPlanet"]
+
+    def test_compact_pickle_data_type(self) -> None:
+        class Unpicklable:
+            def __new__(cls, *args) -> "Unpicklable":
+                return super().__new__(cls)
+
+        class Compact(Unpicklable, Enum, compact_pickle=True):
+            ONE = 1
+
+        Compact.__qualname__ = "CompactUnpicklable"
+        globals()["CompactUnpicklable"] = Compact
+
+        try:
+            assert pickle.loads(pickle.dumps(Compact.ONE)) is Compact.ONE
+
+        finally:
+            del globals()["CompactUnpicklable"]
+
+    def test_pickle_functional(self) -> None:
+        Local = Enum("Local", "ONE TWO THREE")  # can not be found in module globals
+
+        assert pickle.loads(pickle.dumps(Local.TWO)) is Local.TWO
+        assert pickle.loads(pickle.dumps(Local)) is Local
+
+        data = pickle.dumps([Local.ONE, Local.THREE])
+
+        _, functional_tokens = enums._get_functional_registry()
+
+        del functional_tokens[Local._token]  # simulate loading in other process
+
+        one, three = pickle.loads(data)
+
+        Created = type(one)
+
+        assert Created is not Local and type(three) is Created
+        assert (one.name, one.value, three.name, three.value) == ("ONE", 1, "THREE", 3)
+
+        # created again under the same token, so loading again gives the same class
+        assert type(pickle.loads(data)[0]) is Created
+        assert Created._token == Local._token
+
+    def test_pickle_functional_same_spec(self) -> None:
+        def create() -> Any:
+            return Enum("Same", "A B")
+
+        First, Second = create(), create()
+
+        assert First._spec == Second._spec
+
+        assert pickle.loads(pickle.dumps(First.A)) is First.A
+        assert pickle.loads(pickle.dumps(Second.A)) is Second.A
+        assert pickle.loads(pickle.dumps(First)) is First
+
+    def test_create_cached(self) -> None:
+        Local = Enum.create("Local", "ONE TWO", cached=True)
+
+        assert Enum.create("Local", ["ONE", "TWO"], cached=True) is Local
+        assert Enum.create("Local", ONE=1, TWO=2, cached=True) is Local
+        assert Enum.create("Local", "ONE TWO") is not Local
+        assert Enum.create("Local", "ONE TWO", cached=True, start=2) is not Local
+        assert Enum.create("Local", "ONE TWO", cached=True, module="other") is not Local
+        assert IntEnum.create("Local", "ONE TWO", cached=True) is not Local
+
+        enums.cache_created()
+
+        try:
+            assert Enum("Local", "ONE TWO") is Enum("Local", "ONE TWO")
+
+        finally:
+            enums.cache_created(False)
+
+        Local.add_member("THREE", 3)
+
+        assert Enum.create("Local", "ONE TWO", cached=True) is not Local
+
+        Unhashable = Enum.create("Unhashable", ONE=[1], cached=True)
+
+        assert Enum.create("Unhashable", ONE=[1], cached=True) is not Unhashable
+
+    def test_create_cached_collected(self) -> None:
+        spec = Enum.create("Collected", "ONE TWO", cached=True)._spec
+
+        gc.collect()
+
+        functional_enums, _ = enums._get_functional_registry()
+
+        assert spec not in functional_enums
+
 
 class TestSpecial:
     def test_enum_auto_on_missing(self) -> None:
@@ -592,6 +769,22 @@ class TestFlag:
     def test_from_args(self) -> None:
         assert Perm.from_args("r", "w", "x") is Perm.R | Perm.W | Perm.X
         assert Perm.from_args(2, 4) is Perm.R | Perm.W
+        assert Perm.from_args(Perm.R, "w", 1) is Perm.R | Perm.W | Perm.X
+        assert Perm.from_args() is Perm.Z
+
+    def test_from_composite_name(self) -> None:
+        for member in self.VALUES:
+            assert Perm.from_composite_name(member.composite_name) is member
+
+        assert Perm.from_composite_name("r, w") is Perm.from_composite_name(" R|W ") is ~Perm.X
+        assert Perm.from_composite_name("") is Perm.Z
+        assert "r, w" in Perm._tables.cache["composite_names"]
+
+        with pytest.raises(ValueError):
+            Perm.from_composite_name("R|E")
+
+        with pytest.raises(ValueError):
+            Perm.from_composite_name(7)
 
     def test_or(self) -> None:
         for member in self.VALUES:
@@ -614,11 +807,45 @@ class TestFlag:
                 assert member ^ other.value is Perm(member.value ^ other.value)
                 assert member.value ^ other is Perm(member.value ^ other.value)
 
+    def test_invalid_operands(self) -> None:
+        with pytest.raises(TypeError):
+            Perm.R | 8
+
+        with pytest.raises(TypeError):
+            Perm.R & "Z"
+
+        class Other(Flag):
+            R = 4
+
+        with pytest.raises(TypeError):
+            Perm.R ^ Other.R
+
+        assert Perm.R | True is Perm.R | Perm.X  # coerced, since not exactly int
+
     def test_invert(self) -> None:
         for member in self.VALUES:
             assert isinstance(~member, Perm)
             assert ~~member is member
 
+    def test_invert_mask(self) -> None:
+        class Wide(Flag):
+            pass
+
+        Wide.extend((f"F{bit}", 1 << bit) for bit in range(72))
+
+        assert ~Wide.F0 is Wide((1 << 72) - 2) and ~~Wide.F71 is Wide.F71
+
+        Wide.add_member("F72", 1 << 72)
+
+        assert ~Wide.F0 is Wide((1 << 73) - 2)
+
+        class Overlap(Flag):
+            X = 1
+            Y = 2
+            YZ = 6  # 4 is only set along with Y
+
+        assert ~Overlap.Y is Overlap.X and ~Overlap.X is Overlap.YZ
+
     def test_contains(self) -> None:
         assert Perm.R in (Perm.R | Perm.W)
         assert Perm.X not in (Perm.R | Perm.W)
@@ -629,6 +856,23 @@ class TestFlag:
         with pytest.raises(TypeError):
             4 in Perm.R
 
+    def test_iter_bits(self) -> None:
+        assert list(Perm.R | Perm.X) == [Perm.X, Perm.R]
+        assert list(Perm.Z) == [] and len(Perm.Z) == 0
+
+        for member in self.VALUES:
+            assert list(member.iter_bits()) == list(member) == [
+                bit for bit in (Perm.X, Perm.W, Perm.R) if bit in member
+            ]
+            assert len(member) == len(list(member))
+
+        class Shape(IntFlag):
+            ROUND = 1
+            BIG = 4
+            ROUND_BIG = 5
+
+        assert list(~Shape.ROUND) == [Shape.BIG] and len(Shape(7)) == 2
+
     def test_decompose(self) -> None:
         RWX = Perm.from_args("r", "w", "x")
 
@@ -730,6 +974,203 @@ class TestIntFlag:
             assert ~~member is member
 
 
+def run(coroutine: Any) -> Any:
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coroutine)
+
+    finally:
+        loop.close()
+
+
+class Registry(Enum):
+    EUR = "eur"
+
+    # requested batches of values
+    enum_ignore = "batches"
+    batches: List[List[str]] = []
+
+    @classmethod
+    async def enum_resolve(cls, values: List[str]) -> Dict[str, str]:
+        cls.batches.append(values)
+
+        await asyncio.sleep(0)
+
+        if "error" in values:
+            raise RuntimeError("Registry is not available.")
+
+        return {value: value.upper() for value in values if len(value) == 3}
+
+
+class TestAsyncResolve:
+    def setup_method(self) -> None:
+        Registry.batches.clear()
+
+    def test_aresolve(self) -> None:
+        async def resolve() -> List[Registry]:
+            return await asyncio.gather(
+                Registry.aresolve("usd"),
+                Registry.aresolve("eur"),
+                Registry.aresolve("usd"),
+                Registry.aresolve("gbp"),
+            )
+
+        usd, eur, same_usd, gbp = run(resolve())
+
+        assert usd is same_usd is Registry.USD and gbp is Registry.GBP and eur is Registry.EUR
+        assert Registry.batches == [["usd", "gbp"]]  # one batch, without duplicates
+
+        assert run(Registry.aresolve("usd")) is Registry.USD
+        assert len(Registry.batches) == 1
+
+    def test_aresolve_many(self) -> None:
+        members = run(Registry.aresolve_many(["jpy", "eur", "jpy", "chf"]))
+
+        assert members == [Registry.JPY, Registry.EUR, Registry.JPY, Registry.CHF]
+        assert Registry.batches == [["jpy", "chf"]]
+
+        with pytest.raises(ValueError):
+            run(Registry.aresolve_many(["cad", "invalid"]))
+
+        assert Registry.CAD.value == "cad"
+
+        with pytest.raises(RuntimeError):
+            run(Registry.aresolve_many(["aud", "error"]))
+
+        assert "AUD" not in Registry.members
+
+    def test_resolvers(self) -> None:
+        async def resolve() -> Any:
+            future = Registry._request("nzd")
+
+            await asyncio.sleep(0)  # batch is flushed
+
+            resolver = Registry._get_resolver()
+
+            assert len(resolver.tasks) == 1  # running task is referenced
+
+            await future
+
+            await asyncio.sleep(0)  # done callbacks are called
+
+            assert not resolver.tasks and not resolver.pending
+
+            return resolver
+
+        resolver = run(resolve())
+
+        gc.collect()
+
+        assert resolver.loop is None  # closed loop is not kept alive
+        assert not Registry._resolvers
+
+    def test_aresolve_without_resolver(self) -> None:
+        with pytest.raises(ValueError):
+            run(Season.aresolve(13))
+
+        assert run(Season.aresolve_many([1, 4])) == [Season.WINTER, Season.AUTUMN]
+        assert run(Perm.aresolve(3)) is Perm.W | Perm.X
+
+
+class TestIndexes:
+    def test_enum_indexes(self) -> None:
+        class Currency(Enum):
+            enum_indexes = {"code": True, "region": False}
+
+            EURO = ("EUR", "EU")
+            FRANC = ("CHF", "EU")
+            DOLLAR = ("USD", "NA")
+            BUCK = ("USD", "NA")
+
+            def __init__(self, code: str, region: str) -> None:
+                self.code = code
+                self.region = region
+
+        assert Currency.lookup(code="EUR") is Currency.EURO
+        assert Currency.lookup_all(region="EU") == (Currency.EURO, Currency.FRANC)
+        assert Currency.lookup(region="EU", code="CHF") is Currency.FRANC
+        assert Currency.lookup_all(region="NA") == (Currency.DOLLAR,)  # aliases are not indexed
+        assert Currency.lookup_all(region="EU", code="USD") == ()
+        assert Currency.lookup_all(code=[]) == ()
+
+        with pytest.raises(ValueError):
+            Currency.lookup(region="EU")
+
+        with pytest.raises(ValueError):
+            Currency.lookup(code="JPY")
+
+        with pytest.raises(ValueError):
+            Currency.lookup(name="EURO")
+
+        Currency.add_member("YEN", ("JPY", "AS"))
+
+        assert Currency.lookup(code="JPY") is Currency.YEN
+
+        with pytest.raises(ValueError):  # unique index is violated
+            Currency.extend([("RUPEE", ("INR", "AS")), ("ASIAN_EURO", ("EUR", "AS"))])
+
+        assert "RUPEE" not in Currency.members and not Currency.lookup_all(code="INR")
+
+    def test_index_by(self) -> None:
+        class Planet(Enum, indexes="moons"):
+            MERCURY = (3.303e23, 0)
+            VENUS = (4.869e24, 0)
+            EARTH = (5.976e24, 1)
+
+            def __init__(self, mass: float, moons: int) -> None:
+                self.mass = mass
+                self.moons = moons
+
+        assert Planet.lookup_all(moons=0) == (Planet.MERCURY, Planet.VENUS)
+
+        Planet.index_by("mass", unique=True)
+
+        assert Planet.lookup(mass=5.976e24, moons=1) is Planet.EARTH
+
+        with pytest.raises(ValueError):
+            Planet.index_by("moons", unique=True)
+
+        with pytest.raises(TypeError):
+            Planet.index_by("__dict__")
+
+
+class TestStrEnum:
+    def test_str_enum(self) -> None:
+        class Method(StrEnum):
+            GET = auto()
+            POST = auto()
+            PUT = "PUT"
+            PUT_ALIAS = "PUT"
+
+        assert Method.GET == "get" and Method.PUT == "PUT" and isinstance(Method.GET, str)
+        assert Method("post") is Method.POST and Method.PUT_ALIAS is Method.PUT
+        assert Method.GET.value is sys.intern("".join(["g", "e", "t"]))
+        assert f"{Method.POST}" == "post"
+
+    def test_from_value_ci(self) -> None:
+        class Method(StrEnum):
+            GET = "GET"
+            STRASSE = "straße"
+
+        assert Method.from_value_ci("GET") is Method.from_value_ci("get") is Method.GET
+        assert Method.from_value_ci("STRASSE") is Method.STRASSE
+
+        with pytest.raises(ValueError):
+            Method.from_value_ci("post")
+
+        with pytest.raises(ValueError):
+            Method.from_value_ci([])
+
+        Method.add_member("POST", "POST")
+
+        assert Method.from_value_ci("Post") is Method.POST
+
+        Method.freeze()
+
+        assert "folded_values" in Method._tables.cache
+
+
 class TestMutation:
     def test_update_works(self) -> None:
         class Color(Enum):
@@ -758,6 +1199,73 @@ class TestMutation:
         with pytest.raises(ValueError):
             Color.add_member("RED", 0)
 
+    def test_extend(self) -> None:
+        class Color(Enum):
+            RED = 1
+
+        added = Color.extend([("GREEN", 2), ("BLUE", auto()), ("R", 1)])
+
+        assert added == [Color.GREEN, Color.BLUE, Color.RED]
+        assert Color.BLUE.value == 3 and Color.R is Color.RED
+        assert list(Color) == [Color.RED, Color.GREEN, Color.BLUE]
+
+        class Empty(Enum):
+            pass
+
+        Empty.extend({"BLACK": auto(), "WHITE": auto()}, auto_start=10)
+
+        assert Empty.BLACK.value == 10 and Empty.WHITE.value == 11
+
+    def test_extend_atomic(self) -> None:
+        class Point(Enum):
+            ORIGIN = (0, 0)
+
+            def __init__(self, x: int, y: int) -> None:
+                self.x = x
+                self.y = y
+
+        cached_members = Point.get_members()
+
+        with pytest.raises(ValueError):
+            Point.extend([("UP", (0, 1)), ("UP", (0, 2))])
+
+        with pytest.raises(ValueError):
+            Point.extend([("DOWN", (0, -1)), ("ORIGIN", (1, 1))])
+
+        with pytest.raises(TypeError):  # __init__ fails on the second member
+            Point.extend([("LEFT", (-1, 0)), ("x", (1,)), ("RIGHT", (1, 0))])
+
+        assert list(Point) == list(cached_members) == [Point.ORIGIN]
+        assert not hasattr(Point, "LEFT") and not hasattr(Point, "RIGHT")
+
+        class Frozen(Enum, frozen=True):
+            NONE = 0
+
+        with pytest.raises(AttributeError):
+            Frozen.extend({"SOME": 1})
+
+    def test_extend_many(self) -> None:
+        class Code(Enum):
+            pass
+
+        Code.extend((f"C{index}", index) for index in range(10_000))
+        Code.extend((f"A{index}", index) for index in range(10_000))
+
+        assert len(Code) == 10_000 and len(Code.members) == 20_000
+        assert Code.A9999 is Code.C9999 is Code(9999)
+
+    def test_create_aliases(self) -> None:
+        class Unhashable(Enum):
+            ONE = [1]
+            TWO = [2]
+            UNO = [1]
+
+        assert Unhashable.UNO is Unhashable.ONE and len(Unhashable) == 2
+
+        Mixed = Enum("Mixed", [("ONE", 1), ("LIST", [1]), ("UNO", 1.0), ("SINGLE", [1])])
+
+        assert Mixed.UNO is Mixed.ONE and Mixed.SINGLE is Mixed.LIST and len(Mixed) == 2
+
     def test_flag_update(self) -> None:
         class NewPerm(Flag):
             R = 4
@@ -774,6 +1282,753 @@ class TestMutation:
 
         assert NewPerm(0).name == "Z"
 
+    def test_tables_are_copied_on_write(self) -> None:
+        class Color(Enum):
+            RED = 1
+            GREEN = 2
+
+        member_map, value_map = Color._member_map, Color._value_map
+        member_names, member_values = Color._member_names, Color._member_values
+
+        Color.add_member("BLUE", 3)
+
+        assert "BLUE" not in member_map and 3 not in value_map
+        assert member_names == ["RED", "GREEN"] and member_values == [1, 2]
+
+        assert Color.BLUE is Color(3) is Color["BLUE"]
+
+    def test_snapshots(self) -> None:
+        class Code(Enum, indexes=["parity"]):
+            ZERO = 0
+
+            @property
+            def parity(self) -> int:
+                return self.value % 2
+
+        snapshot = Code._tables
+
+        Code.add_member("ONE", 1)
+
+        assert Code._tables is not snapshot
+        assert snapshot.member_tuple == (Code.ZERO,) and "ONE" not in snapshot.member_map
+
+        stop = threading.Event()
+        errors = []
+
+        def reader() -> None:
+            while not stop.is_set():  # tables of one snapshot always agree with each other
+                tables = Code._tables
+                names = [member.name for member in tables.member_tuple]
+
+                if names != tables.member_names or set(names) != set(tables.member_map):
+                    errors.append(names)
+
+                indexed = sum(map(len, tables.indexes["parity"].values()))
+
+                if indexed != len(names):
+                    errors.append(names)
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+
+        try:
+            for value in range(2, 500):
+                Code.add_member(f"M{value}", value)
+
+        finally:
+            stop.set()
+            thread.join()
+
+        assert not errors
+
+    def test_concurrent_writers(self) -> None:
+        class Wide(Flag):
+            pass
+
+        Wide.update(**{f"F{bit}": 1 << bit for bit in range(8)})
+
+        THREADS = 8
+
+        barrier = threading.Barrier(THREADS)
+        results = [[] for _ in range(THREADS)]
+
+        def worker(index: int) -> None:
+            barrier.wait()
+
+            Wide.add_member(f"EXTRA{index}", 1 << (8 + index))
+
+            for value in range(256):
+                results[index].append(Wide(value))
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(THREADS)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        for result in results:
+            for value, member in enumerate(result):
+                assert member is results[0][value] is Wide(value)
+
+        assert all(f"EXTRA{index}" in Wide.members for index in range(THREADS))
+        assert len(Wide) == 8 + THREADS
+
+
+class TestFrozen:
+    def test_frozen_keyword(self) -> None:
+        class Color(Enum, frozen=True):
+            RED = 1
+            GREEN = 2
+
+        assert Color.enum_frozen
+
+        with pytest.raises(AttributeError):
+            Color.add_member("BLUE", 3)
+
+        with pytest.raises(AttributeError):
+            Color.update(BLUE=3)
+
+        assert len(Color) == 2
+
+    def test_freeze(self) -> None:
+        class Color(Enum):
+            RED = 1
+            GREEN = 2
+
+        Color.add_member("BLUE", 3)
+
+        assert not Color.enum_frozen
+
+        Color.freeze()
+
+        assert Color.enum_frozen
+
+        with pytest.raises(AttributeError):
+            Color.add_member("ALPHA", 0)
+
+        assert Color.from_name("blue") is Color.BLUE
+        assert Color.as_dict() == {"red": 1, "green": 2, "blue": 3}
+
+    def test_frozen_from_name(self) -> None:
+        class Color(Enum, frozen=True):
+            RED = 1
+            DARK_RED = 2
+
+        assert "from_name" in Color.__dict__  # bound to prebuilt table
+        assert Color.from_name("DarkRed") is Color.from_value("dark_red") is Color.DARK_RED
+
+        with pytest.raises(KeyError):
+            Color.from_name("blue")
+
+        assert "from_name" not in Enum.__dict__
+
+    def test_frozen_index_by(self) -> None:
+        class Color(Enum, frozen=True):
+            RED = 1
+            GREEN = 2
+
+        Color.index_by("name")
+
+        assert "lower_names" in Color._tables.cache  # caches are built again
+        assert Color.lookup(name="GREEN") is Color.from_name("green") is Color.GREEN
+
+    def test_frozen_flag(self) -> None:
+        class FrozenPerm(Flag, frozen=True):
+            Z = 0
+            X = 1
+            W = 2
+            R = 4
+
+        assert (FrozenPerm.R | FrozenPerm.W).decompose() == [FrozenPerm.R, FrozenPerm.W]
+        assert str(~FrozenPerm.X) == "FrozenPerm.R|W"
+
+    def test_caches_are_reset(self) -> None:
+        class Color(Enum):
+            RED = 1
+
+        assert Color.lower_names == {"red": Color.RED}
+
+        Color.add_member("DARK_RED", 2)
+
+        assert Color.from_name("dark_red") is Color.DARK_RED
+        assert Color.as_dict() == {"red": 1, "dark_red": 2}
+
+
+class TestInstrument:
+    def test_instrument(self) -> None:
+        class Color(Enum):
+            RED = 1
+            GREEN = 2
+
+        stats = enums.instrument(Color)
+
+        assert enums.instrument(Color) is stats
+
+        Color(1), Color(2), Color(Color.RED)
+        Color.from_name("red")
+
+        with pytest.raises(ValueError):
+            Color(3)
+
+        with pytest.raises(ValueError):
+            Color([])
+
+        counters = stats.as_dict()
+
+        assert counters["value_hits"] == 2
+        assert counters["value_misses"] == 2
+        assert counters["linear_scans"] == 1
+        assert counters["missing_calls"] == 2
+        assert counters["name_lookups"] == 1
+        assert counters["creation_time"] is None
+
+        stats.reset()
+
+        assert not any(stats.as_dict()[name] for name in stats.COUNTERS)
+
+        enums.uninstrument(Color)
+
+        Color(1)
+        Color.from_name("green")
+
+        assert Color._stats is None and stats.value_hits == stats.name_lookups == 0
+        assert "from_name" not in Color.__dict__  # default from_name() is restored
+
+    def test_instrument_frozen(self) -> None:
+        class Color(Enum, frozen=True):
+            RED = 1
+
+        stats = enums.instrument(Color)
+
+        assert Color.from_name("red") is Color.RED
+        assert stats.name_lookups == 1
+
+        enums.uninstrument(Color)
+
+        assert Color.from_name("red") is Color.RED
+        assert "from_name" in Color.__dict__  # bound to prebuilt table again
+
+    def test_instrument_flag(self) -> None:
+        class Shape(IntFlag):
+            ROUND = 1
+            BIG = 2
+
+        stats = enums.instrument(Shape)
+
+        Shape.ROUND | Shape.BIG
+        Shape(8)
+
+        assert stats.composites_created == 2
+
+    def test_instrument_all(self) -> None:
+        enums.instrument()
+
+        try:
+            class Color(Enum):
+                RED = 1
+
+        finally:
+            enums.uninstrument()
+
+        class Other(Enum):
+            ONE = 1
+
+        assert Color._stats.creation_time is not None
+        assert Other._stats is None
+
+    def test_instrument_base(self) -> None:
+        class Base(Enum):
+            pass
+
+        enums.instrument(Base)
+
+        class Color(Base):
+            RED = 1
+
+        assert Color(1) is Color.RED
+
+
+class TestProfileCreation:
+    def test_profile_creation(self) -> None:
+        enums.profile_creation()
+
+        try:
+
+            class Color(Enum):
+                RED = 1
+                GREEN = 2
+                DARK_GREEN = 2
+
+                time.sleep(0.01)  # slow class body has to be included in total time
+
+            Shape = Enum("Shape", "ROUND SQUARE")
+
+        finally:
+            enums.profile_creation(False)
+
+        profiles = {profile.qualname: profile for profile in enums.creation_report()}
+
+        color = profiles[Color.__qualname__]
+
+        assert color.module == __name__
+        assert color.member_count == 2 and color.alias_count == 1
+        assert color.total_time >= color.member_time >= color.alias_scan_time >= 0
+        assert color.total_time >= color.body_time + color.resolve_time
+        assert color.body_time >= 0.01
+
+        shape = profiles["Shape"]
+
+        assert shape.module == Shape.__module__ == __name__
+        assert shape.member_count == 2
+
+        class Untracked(Enum):
+            NONE = 0
+
+        assert Untracked.__qualname__ not in (
+            profile.qualname for profile in enums.creation_report()
+        )
+
+    def test_creation_report(self) -> None:
+        enums.profile_creation()
+
+        try:
+            Enum("Profiled", "ONE TWO")
+
+        finally:
+            enums.profile_creation(False)
+
+        report = enums.creation_report("member_count")
+
+        assert [profile.member_count for profile in report] == sorted(
+            (profile.member_count for profile in report), reverse=True
+        )
+
+        with pytest.raises(ValueError):
+            enums.creation_report("unknown")
+
+        file = io.StringIO()
+
+        enums.print_creation_report(limit=1, file=file)
+
+        lines = file.getvalue().splitlines()
+
+        assert len(lines) == 2 and "total_ms" in lines[0]
+
+
+class TestMemoryReport:
+    CATEGORIES = (
+        "members",
+        "composites",
+        "aliases",
+        "values",
+        "member_map",
+        "value_map",
+        "member_tuples",
+        "indexes",
+        "caches",
+        "total",
+    )
+
+    def test_memory_report(self) -> None:
+        report = enums.memory_report(Season)
+
+        assert tuple(report) == self.CATEGORIES
+        assert report["members"] and report["aliases"]
+        assert report["total"] == sum(report[name] for name in self.CATEGORIES[:-1])
+
+    def test_composites(self) -> None:
+        class Wide(Flag):
+            pass
+
+        Wide.update(**{f"F{bit}": 1 << bit for bit in range(8)})
+
+        before = enums.memory_report(Wide)
+
+        assert not before["composites"]
+
+        for value in range(256):
+            Wide(value)
+
+        after = enums.memory_report(Wide)
+
+        assert after["composites"] and after["value_map"] > before["value_map"]
+
+    def test_memory_reports(self) -> None:
+        reports = enums.memory_reports()
+
+        assert Season in dict(reports)
+
+        totals = [report["total"] for _, report in reports]
+
+        assert totals == sorted(totals, reverse=True)
+
+
+class TestJSON:
+    def test_invalid_by(self) -> None:
+        with pytest.raises(ValueError):
+            JSONCodec(by="title")
+
+    def test_by_value(self) -> None:
+        codec = JSONCodec()
+
+        assert json.dumps({"season": Season.SPRING}, default=codec.default) == '{"season": 2}'
+
+        with pytest.raises(TypeError):
+            json.dumps(PickleClass(), default=codec.default)
+
+        members = [Season.WINTER, Season.FALL]
+
+        assert codec.loads(Season, codec.dumps(members)) == members
+        assert codec.loads(Point, codec.dumps([Point.UNIT])) == [Point.UNIT]
+        assert codec.decode(Perm, 7) is Perm.R | Perm.W | Perm.X
+
+        with pytest.raises(ValueError):
+            codec.decode(Season, 13)
+
+    def test_by_name(self) -> None:
+        codec = JSONCodec(by="name")
+
+        members = [Perm.R, Perm.R | Perm.W, Perm.Z, IntPerm.R | 8]
+        string = codec.dumps(members)
+
+        assert json.loads(string) == ["R", ["R", "W"], "Z", [8, "R"]]
+
+        assert codec.loads(Perm, codec.dumps(members[:-1])) == members[:-1]
+        assert codec.loads(IntPerm, string)[-1] is IntPerm.R | 8
+
+        assert codec.decode(Season, "fall") is Season.AUTUMN
+
+        for data in ("broken", 13, ["R", "broken"]):
+            with pytest.raises(ValueError):
+                codec.decode(Perm, data)
+
+
+class TestParseStream:
+    def test_invalid_arguments(self) -> None:
+        with pytest.raises(ValueError):
+            Season.parse_stream([], by="title")
+
+        with pytest.raises(ValueError):
+            Season.parse_stream([], on_error="ignore")
+
+        with pytest.raises(ValueError):
+            Season.parse_stream([], on_error="default")
+
+    def test_lazy(self) -> None:
+        stream = Season.parse_stream(itertools.cycle([1, 2, 3, 4]))
+
+        assert list(itertools.islice(stream, 6)) == [
+            Season.WINTER, Season.SPRING, Season.SUMMER, Season.AUTUMN, Season.WINTER, Season.SPRING
+        ]
+
+        assert stream.count == 6
+        assert len(stream.memo) == 4
+
+    def test_by(self) -> None:
+        tokens = ["winter", "SUMMER", "4"]
+
+        assert list(Season.parse_stream(tokens, by="name", on_error="skip")) == [
+            Season.WINTER, Season.SUMMER
+        ]
+        assert list(Season.parse_stream(tokens, by="auto", on_error="skip")) == [
+            Season.WINTER, Season.SUMMER
+        ]
+        assert list(Season.parse_stream(tokens, by="auto", convert=str.upper, on_error="skip")) == [
+            Season.WINTER, Season.SUMMER
+        ]
+        assert list(Season.parse_stream(["1", "4"], convert=int)) == [Season.WINTER, Season.FALL]
+
+    def test_on_error(self) -> None:
+        tokens = ["1", "13", "x", "13", "2"]
+
+        with pytest.raises(ValueError):
+            list(Season.parse_stream(tokens, convert=int))
+
+        stream = Season.parse_stream(tokens, convert=int, on_error="default", default="winter")
+
+        assert list(stream) == [Season.WINTER] * 4 + [Season.SPRING]
+
+        stream = Season.parse_stream(tokens, convert=int, on_error="collect")
+
+        assert list(stream) == [Season.WINTER, Season.SPRING]
+        assert stream.errors == [(1, "13"), (2, "x"), (3, "13")]
+        assert (stream.count, stream.invalid) == (5, 3)
+
+    def test_unhashable(self) -> None:
+        class ListEnum(list, Enum):
+            empty = []
+
+        assert list(ListEnum.parse_stream([[], []])) == [ListEnum.empty] * 2
+
+    def test_aparse(self) -> None:
+        read = []
+
+        async def tokens() -> AsyncIterator[str]:
+            for token in ["1", "13", "x", "4", "2"]:
+                read.append(token)
+                yield token
+
+        async def parse(stream: Any, limit: Optional[int] = None) -> List[Season]:
+            members = []
+
+            async for member in stream:
+                members.append(member)
+
+                if len(members) == limit:
+                    break
+
+            return members
+
+        stream = Season.aparse(tokens(), convert=int, on_error="collect", batch_size=2)
+
+        assert run(parse(stream, limit=1)) == [Season.WINTER]
+        assert read == ["1", "13"]  # only first batch is read
+
+        read.clear()
+
+        stream = Season.aparse(tokens(), convert=int, on_error="collect", batch_size=2)
+
+        assert run(parse(stream)) == [Season.WINTER, Season.AUTUMN, Season.SPRING]
+        assert stream.errors == [(1, "13"), (2, "x")]
+        assert (stream.count, stream.invalid) == (5, 2)
+
+        with pytest.raises(ValueError):
+            run(parse(Season.aparse(tokens(), convert=int)))
+
+        with pytest.raises(TypeError):
+            iter(Season.aparse(tokens()))
+
+        with pytest.raises(ValueError):
+            Season.aparse(tokens(), batch_size=0)
+
+    def test_aparse_keeps_members_before_error(self) -> None:
+        async def tokens() -> AsyncIterator[int]:
+            for token in (1, 2, 13):
+                yield token
+
+        members = []
+
+        async def parse() -> None:
+            async for member in Season.aparse(tokens()):
+                members.append(member)
+
+        with pytest.raises(ValueError):
+            run(parse())
+
+        assert members == [Season.WINTER, Season.SPRING]
+
+
+class TestPack:
+    def test_pack(self) -> None:
+        members = [Season.WINTER, Season.FALL, Season.SUMMER, Season.WINTER]
+
+        data = Season.pack(members)
+
+        assert data == bytes([0, 3, 2, 0])
+
+        unpacked = Season.unpack(data)
+
+        assert len(unpacked) == 4
+        assert list(unpacked) == members
+        assert unpacked[1] is Season.AUTUMN
+        assert list(unpacked[1:3]) == [Season.AUTUMN, Season.SUMMER]
+
+        assert Season.pack([1, 2]) == bytes([0, 1])
+
+    def test_pack_wide(self) -> None:
+        Wide = Enum("Wide", [f"M{index}" for index in range(300)])
+
+        assert Wide.get_typecode() == "H"
+
+        members = [Wide.M299, Wide.M0, Wide.M256]
+
+        data = Wide.pack(members)
+
+        assert len(data) == 6
+        assert list(Wide.unpack(data)) == members
+
+    def test_pack_flag(self) -> None:
+        members = [IntPerm.R | IntPerm.W, IntPerm.R | 8, ~IntPerm.X, IntPerm.Z]
+
+        data = IntPerm.pack(members)
+
+        assert len(data) == 32
+        assert list(IntPerm.unpack(data)) == members
+
+        assert list(Perm.unpack(Perm.pack([Perm.R | Perm.X]))) == [Perm.R | Perm.X]
+
+    def test_pack_flag_overflow(self) -> None:
+        Wide = Flag("Wide", [(f"F{bit}", 1 << bit) for bit in range(72)])
+
+        with pytest.raises(ValueError, match="63 bits"):
+            Wide.get_typecode()
+
+        with pytest.raises(ValueError, match="63 bits"):
+            Wide.pack([Wide.F0])
+
+        class High(IntFlag):
+            A = 1 << 62
+
+        assert list(High.unpack(High.pack([High.A]))) == [High.A]
+
+        with pytest.raises(ValueError, match="63 bits"):
+            High.pack([1 << 63])
+
+    def test_unpack_without_copy(self) -> None:
+        buffer = bytearray(Season.pack([Season.WINTER, Season.SPRING]))
+
+        with Season.unpack(memoryview(buffer)) as unpacked:
+            buffer[0] = 2
+
+            assert unpacked[0] is Season.SUMMER
+
+        buffer.append(0)  # view was released, so we can resize the buffer
+
+    def test_convert_file(self, tmp_path: Path) -> None:
+        values = [1, 3, 4, 2] * 50
+        path = tmp_path / "seasons.txt"
+        path.write_text("".join(f"{value}\n" for value in values))
+
+        expected = Season.pack(values)
+
+        for workers in (1, 2):
+            codes = Season.convert_file(path, workers=workers, chunk_size=7, convert=int)
+
+            assert codes.typecode == "B"
+            assert codes.tobytes() == expected
+
+        path.write_text("winter\nFALL\nSummer\n13\n")
+
+        codes = Season.convert_file(path, by="name", on_error="default", default=Season.SPRING)
+
+        assert list(Season.unpack(codes)) == [
+            Season.WINTER, Season.AUTUMN, Season.SUMMER, Season.SPRING
+        ]
+
+        with pytest.raises(ValueError, match="line 4"):
+            Season.convert_file(path, by="name")
+
+        with pytest.raises(ValueError):
+            Season.convert_file(path, on_error="skip")
+
+    def test_convert_file_flag(self, tmp_path: Path) -> None:
+        path = tmp_path / "perms.txt"
+        path.write_text("4\n6\n0\n7\n")
+
+        codes = Perm.convert_file(path, workers=2, chunk_size=2, convert=int)
+
+        assert list(Perm.unpack(codes)) == [Perm.R, Perm.R | Perm.W, Perm.Z, ~Perm.Z]
+
+    @pytest.mark.skipif(sys.version_info < (3, 8), reason="shared memory requires Python 3.8")
+    def test_share(self) -> None:
+        members = [Season.WINTER, Season.FALL, Season.WINTER]
+
+        shared = Season.share(members)
+
+        assert shared.owner and list(shared) == members
+        assert list(shared[1:]) == members[1:]
+
+        attached = pickle.loads(pickle.dumps(shared))  # attaches by name
+
+        assert not attached.owner and attached.name == shared.name
+
+        with Season.attach(shared.name, 3) as other:
+            assert list(other) == members
+
+        attached.release()  # attached segments are only closed
+
+        assert list(shared) == members
+
+        with ProcessPoolExecutor(2) as executor:
+            counts = executor.map(count_shared, [shared] * 2, [Season.WINTER, Season.AUTUMN])
+
+            assert list(counts) == [2, 1]
+
+        shared.release()
+
+        with pytest.raises(FileNotFoundError):
+            Season.attach(shared.name)
+
+        name = Perm.share(array("q", [6, 0])).name  # arrays of codes are shared as is
+
+        gc.collect()  # segment is unlinked when the owner is collected
+
+        with pytest.raises(FileNotFoundError):
+            Perm.attach(name)
+
+    @pytest.mark.skipif(sys.version_info < (3, 8), reason="shared memory requires Python 3.8")
+    def test_attach_from_other_process(self) -> None:
+        members = [Season.WINTER, Season.FALL, Season.WINTER]
+
+        shared = Season.share(members)
+
+        code = (
+            "from test_enums import Season\n"
+            f"with Season.attach({shared.name!r}, 3) as members:\n"
+            "    print(members.count(Season.WINTER))"
+        )
+
+        output = subprocess.run(  # unrelated process, which has its own resource tracker
+            [sys.executable, "-c", code],
+            cwd=str(Path(enums.__file__).parent),
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        ).stdout
+
+        assert output.split() == ["2"]
+
+        with Season.attach(shared.name, 3) as attached:  # segment was not unlinked on exit
+            assert list(attached) == members
+
+        shared.release()
+
+
+class TestBench:
+    def test_run(self) -> None:
+        bench_enums = pytest.importorskip("bench_enums")  # benchmarks are not distributed
+
+        results = bench_enums.run(["member_by_name", "member_by_ci_name"], repeat=1)
+
+        assert [result["name"] for result in results] == ["member_by_name", "member_by_ci_name"]
+
+        by_name, by_ci_name = results
+
+        assert by_name["enums"] > 0 and by_name["stdlib"] > 0 and by_name["ratio"] > 0
+        assert by_ci_name["stdlib"] is None and by_ci_name["ratio"] is None
+
+    def test_import(self) -> None:
+        bench_enums = pytest.importorskip("bench_enums")
+
+        (result,) = bench_enums.run(["import"], repeat=1)
+
+        assert result["enums"] > 0 and result["stdlib"] > 0
+
+    LAZY_MODULES = (
+        "array",
+        "collections",
+        "copyreg",
+        "json",
+        "threading",
+        "typing",
+        "weakref",
+    )
+
+    def test_lazy_imports(self) -> None:
+        code = f"import sys, enums; print(*(name in sys.modules for name in {self.LAZY_MODULES}))"
+
+        output = subprocess.run(
+            [sys.executable, "-S", "-c", code],
+            cwd=str(Path(enums.__file__).parent),
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        ).stdout
+
+        assert output.split() == ["False"] * len(self.LAZY_MODULES)
+
 
 class TestOrder:
     def test_order(self) -> None: